@@ -52,9 +52,8 @@ plot = (
 )
 
 buf = BytesIO()
-plot.save(buf, format="png")
-buf.seek(0)
-plot1_bytes = buf.read()
+plot.save(buf, format="png", dpi=72, verbose=False)
+plot1_bytes = buf.getvalue()
 
 df_monthly = (
     df.with_columns(
@@ -88,9 +87,8 @@ hist_plot = (
 )
 
 buf2 = BytesIO()
-hist_plot.save(buf2, format="png")
-buf2.seek(0)
-plot2_bytes = buf2.read()
+hist_plot.save(buf2, format="png", dpi=72, verbose=False)
+plot2_bytes = buf2.getvalue()
 
 mjml_content = """
 <mjml>
@@ -12,6 +12,11 @@ from .egress import (
     send_email_with_yagmail,
     send_email_with_mailgun,
     send_email_with_smtp,
+    SMTPMailer,
+    GmailMailer,
+    SMTPPool,
+    send_email_with_smtp_async,
+    send_emails_with_smtp_async,
 )
 
 from .utils import write_email_message_to_file
@@ -31,5 +36,10 @@ __all__ = [
     "send_email_with_yagmail",
     "send_email_with_mailgun",
     "send_email_with_smtp",
+    "SMTPMailer",
+    "GmailMailer",
+    "SMTPPool",
+    "send_email_with_smtp_async",
+    "send_emails_with_smtp_async",
     "write_email_message_to_file",
 ]
@@ -352,6 +352,33 @@ def block_image(
       during email processing by mjml_to_email().
     - If `float` is not "none", it takes precedence and overrides `align`.
     """
+    # Detect URL vs local file
+    if _is_url(file):
+        src = file
+    else:
+        # For local files, read as bytes for processing by _process_mjml_images
+        file_path = Path(file)
+        if not file_path.exists():
+            raise FileNotFoundError(f"Image file not found: {file}")
+        if not file_path.is_file():
+            raise ValueError(f"Path is not a file: {file}")
+        
+        with open(file_path, "rb") as f:
+            src = f.read()
+
+    return _image_block(src, alt=alt, width=width, align=align, float=float)
+
+
+def _image_block(
+    src: Union[str, bytes],
+    alt: str,
+    width: Union[int, str],
+    align: str,
+    float: str,
+) -> Block:
+    """
+    Wrap an image source (URL or raw bytes) in a Block with an MJML image tag.
+    """
     if isinstance(width, int):
         width_str = f"{width}px"
     else:
@@ -369,20 +396,6 @@ def block_image(
         elif align == "right":
             align_style = "display: block; margin: 0 0 0 auto;"
 
-    # Detect URL vs local file
-    if _is_url(file):
-        src = file
-    else:
-        # For local files, read as bytes for processing by _process_mjml_images
-        file_path = Path(file)
-        if not file_path.exists():
-            raise FileNotFoundError(f"Image file not found: {file}")
-        if not file_path.is_file():
-            raise ValueError(f"Path is not a file: {file}")
-        
-        with open(file_path, "rb") as f:
-            src = f.read()
-
     attrs = {
         "src": src,
         "alt": alt,
@@ -410,7 +423,7 @@ def block_plot(
     """
     Create a block containing an embedded plotnine plot.
 
-    This function saves a plotnine plot to a temporary PNG file and wraps it as a Block
+    This function renders a plotnine plot to an in-memory PNG and wraps it as a Block
     with an embedded image.
 
     Parameters
@@ -464,9 +477,8 @@ def block_plot(
     )
     ```
     """
-    import tempfile
-    from pathlib import Path
     import importlib.util
+    from io import BytesIO
 
     if importlib.util.find_spec("plotnine") is None:
         raise ImportError(
@@ -474,24 +486,15 @@ def block_plot(
             "Install it with: pip install plotnine"
         )
 
-    # Create a temporary PNG file
-    tmpfile = tempfile.NamedTemporaryFile(suffix=".png", delete=False)
-    tmpfile_path = tmpfile.name
-    tmpfile.close()
-
-    try:
-        fig.save(tmpfile_path, dpi=200, verbose=False)
+    # Render straight into memory; block_image would only read the file back
+    buf = BytesIO()
+    fig.save(buf, format="png", dpi=200, verbose=False)
 
-        img_block = block_image(
-            file=tmpfile_path,
-            alt=alt,
-            width=width,
-            align=align,
-            float=float,
-        )
-
-        return img_block
-
-    finally:
-        Path(tmpfile_path).unlink(missing_ok=True)
+    return _image_block(
+        buf.getvalue(),
+        alt=alt,
+        width=width,
+        align=align,
+        float=float,
+    )
 
@@ -12,6 +12,8 @@ __all__ = [
     "add_readable_time",
 ]
 
+_URL_RE = re.compile(r"^(https?:)?//", re.IGNORECASE)
+
 
 def _process_markdown(content: Optional[str]) -> Optional[str]:
     """
@@ -88,8 +90,7 @@ def _is_url(file: str) -> bool:
     bool
         True if file is a URL (http://, https://, or //), False otherwise.
     """
-    pattern = r"^(https?:)?//"
-    return bool(re.match(pattern, file, re.IGNORECASE))
+    return _URL_RE.match(file) is not None
 
 
 def _guess_mime_type(file: str) -> str:
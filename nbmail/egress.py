@@ -1,22 +1,36 @@
 from __future__ import annotations
-import base64
+
+# pybase64 is a drop-in for the base64 functions used here, with SIMD codecs
+try:
+    import pybase64 as base64
+except ImportError:
+    import base64
+
 import os
 
-from email.mime.multipart import MIMEMultipart
-from email.mime.text import MIMEText
-from email.mime.image import MIMEImage
 import smtplib
 
-import mimetypes
-from email.mime.base import MIMEBase
-from email import encoders
-from typing import Literal
+from email.charset import Charset
+from email.encoders import encode_noop
+from contextlib import ExitStack, contextmanager
+from functools import lru_cache
+import queue
+import re
+import socket
+import threading
+import time
+from typing import TYPE_CHECKING, Iterable, Iterator, Literal
 
 from .ingress import quarto_json_to_email
 
 from .structs import Email
 import warnings
 
+if TYPE_CHECKING:
+    from email.mime.base import MIMEBase
+    from email.mime.image import MIMEImage
+    from email.mime.text import MIMEText
+
 __all__ = [
     "send_quarto_email_with_gmail",
     "send_email_with_gmail",
@@ -24,6 +38,11 @@ __all__ = [
     "send_email_with_yagmail",
     "send_email_with_mailgun",
     "send_email_with_smtp",
+    "SMTPMailer",
+    "GmailMailer",
+    "SMTPPool",
+    "send_email_with_smtp_async",
+    "send_emails_with_smtp_async",
 ]
 
 
@@ -32,12 +51,15 @@ __all__ = [
 def send_quarto_email_with_gmail(
     username: str,
     password: str,
-    json_path: str,
+    json_path: str | Iterable[str],
     recipients: list[str],
 ):
     """
     Send an email using Gmail with content from a Quarto metadata JSON file.
 
+    Several JSON files can be given at once; their emails are then sent one after
+    another over a single Gmail connection.
+
     Parameters
     ----------
     username
@@ -47,7 +69,8 @@ def send_quarto_email_with_gmail(
         Gmail app password
 
     json_path
-        Path to the Quarto-generated .output_metadata.json file
+        Path to the Quarto-generated .output_metadata.json file, or an iterable of
+        such paths
 
     recipients
         List of email addresses to send the email to
@@ -68,11 +91,13 @@ def send_quarto_email_with_gmail(
     )
     ```
     """
-    i_email: Email = quarto_json_to_email(json_path)
-    i_email.recipients = recipients
-    send_email_with_gmail(
-        username=username, password=password, i_email=i_email
-    )
+    json_paths = [json_path] if isinstance(json_path, (str, os.PathLike)) else json_path
+
+    with GmailMailer(username=username, password=password) as mailer:
+        for path in json_paths:
+            i_email: Email = quarto_json_to_email(path)
+            i_email.recipients = recipients
+            mailer.send(i_email)
 
 
 ### Methods to send the email from the intermediate data structure with different services ###
@@ -80,7 +105,7 @@ def send_quarto_email_with_gmail(
 
 # Could also take creds object
 def send_email_with_gmail(
-    username: str, password: str, i_email: Email
+    username: str, password: str, i_email: Email, pool: SMTPPool | None = None
 ):
     """
     Send an Email object via Gmail.
@@ -96,6 +121,11 @@ def send_email_with_gmail(
     i_email
         Email object containing the email content and attachments
 
+    pool
+        Optional `SMTPPool` to send through. When given, the email is sent over one
+        of the pool's open connections instead of a new one, and `username` and
+        `password` are not used.
+
     Returns
     -------
     None
@@ -113,6 +143,10 @@ def send_email_with_gmail(
     send_email_with_gmail("user@gmail.com", "password123", email)
     ```
     """
+    if pool is not None:
+        pool.send(i_email)
+        return
+
     # Compose the email
     return send_email_with_smtp(
         smtp_host="smtp.gmail.com",
@@ -216,16 +250,16 @@ def send_email_with_mailgun(
     -----
     Requires the `mailgun` package: `pip install mailgun`
     """
-    from mailgun.client import Client
-
-    # Create Mailgun client
-    client = Client(auth=("api", api_key))
-
     if i_email.recipients is None:
         raise TypeError(
             "i_email must have a populated recipients attribute. Currently, i_email.recipients is None."
         )
 
+    from mailgun.client import Client
+
+    # Create Mailgun client
+    client = Client(auth=("api", api_key))
+
     # Prepare the basic email data
     data = {
         "from": sender,
@@ -242,24 +276,30 @@ def send_email_with_mailgun(
     files = []
 
     # Handle inline images (embedded in HTML with cid:)
-    for image_name, image_base64 in i_email.inline_attachments.items():
-        img_bytes = base64.b64decode(image_base64)
+    for image_name, image_data in (i_email.inline_attachments or {}).items():
+        img_bytes = (
+            image_data
+            if isinstance(image_data, bytes)
+            else base64.b64decode(image_data)
+        )
         # Use 'inline' for images referenced in HTML with cid:
         files.append(("inline", (image_name, img_bytes)))
 
-    # Handle external attachments
-    for filename in i_email.external_attachments:
-        with open(filename, "rb") as f:
-            file_data = f.read()
+    with ExitStack() as stack:
+        # Handle external attachments; open handles are passed so the HTTP layer
+        # reads each file itself instead of receiving a second in-memory copy
+        for filename in i_email.external_attachments or ():
+            f = stack.enter_context(open(filename, "rb"))
 
-        # Extract just the filename (not full path) for the attachment name
-        basename = os.path.basename(filename)
-        files.append(("attachment", (basename, file_data)))
+            # Extract just the filename (not full path) for the attachment name
+            basename = os.path.basename(filename)
+            main_type, sub_type = _guess_mime_type(os.path.splitext(filename)[1].lower())
+            files.append(("attachment", (basename, f, f"{main_type}/{sub_type}")))
 
-    # Send the message using Mailgun client
-    response = client.messages.create(
-        data=data, files=files if files else None, domain=domain
-    )
+        # Send the message using Mailgun client
+        response = client.messages.create(
+            data=data, files=files if files else None, domain=domain
+        )
 
     # The response object has a .json() method that returns the actual data
     return response
@@ -271,7 +311,8 @@ def send_email_with_smtp(
     username: str,
     password: str,
     i_email: Email,
-    security: str = Literal["tls", "ssl", "smtp"],
+    security: Literal["tls", "ssl", "smtp"] = "tls",
+    pool: SMTPPool | None = None,
 ):
     """
     Send an Email object via SMTP.
@@ -297,6 +338,11 @@ def send_email_with_smtp(
         Security protocol to use: "tls" (STARTTLS), "ssl" (SSL/TLS), or "smtp" (plain SMTP).
         Default is "tls".
 
+    pool
+        Optional `SMTPPool` to send through. When given, the email is sent over one
+        of the pool's open connections instead of a new one, and the connection
+        arguments above are not used.
+
     Returns
     -------
     None
@@ -327,74 +373,965 @@ def send_email_with_smtp(
     )
     ```
     """
+    if pool is not None:
+        pool.send(i_email)
+        return
+
+    with SMTPMailer(
+        smtp_host=smtp_host,
+        smtp_port=smtp_port,
+        username=username,
+        password=password,
+        security=security,
+    ) as mailer:
+        mailer.send(i_email)
+
+
+class SMTPMailer:
+    """
+    A reusable SMTP connection for sending several Email objects.
+
+    Opening an SMTP connection involves a TLS handshake and an authentication
+    round-trip, which usually costs more than sending a small message. `SMTPMailer`
+    connects and logs in once, then sends any number of emails over the same
+    connection. A connection left idle for a while is checked with NOOP before it
+    is reused, and reopened if the server has dropped it (e.g. an idle timeout).
+    If the connection drops while a message is being sent, the error is raised
+    rather than resending a message the server may already have accepted.
+
+    Parameters
+    ----------
+    smtp_host
+        SMTP server hostname (e.g., "smtp.example.com")
+
+    smtp_port
+        SMTP server port (typically 587 for TLS, 465 for SSL, 25 for plain SMTP)
+
+    username
+        SMTP account username for authentication
+
+    password
+        SMTP account password
+
+    security
+        Security protocol to use: "tls" (STARTTLS), "ssl" (SSL/TLS), or "smtp" (plain SMTP).
+        Default is "tls".
+
+    Raises
+    ------
+    ValueError
+        If security parameter is not one of "tls", "ssl", or "smtp"
+
+    Examples
+    --------
+    ```python
+    with SMTPMailer("smtp.example.com", 587, "user@example.com", "password123") as mailer:
+        for email in emails:
+            mailer.send(email)
+    ```
+    """
+
+    def __init__(
+        self,
+        smtp_host: str,
+        smtp_port: int,
+        username: str,
+        password: str,
+        security: Literal["tls", "ssl", "smtp"] = "tls",
+    ):
+        _check_security(security)
+
+        self.smtp_host = smtp_host
+        self.smtp_port = smtp_port
+        self.username = username
+        self.password = password
+        self.security = security
+
+        self._stack: ExitStack | None = None
+        self._server: smtplib.SMTP | None = None
+        self._last_used = 0.0
+
+    def __enter__(self) -> "SMTPMailer":
+        self.connect()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def connect(self) -> None:
+        """
+        Open and authenticate the SMTP connection, if it is not already open.
+        """
+        if self._server is not None:
+            return
+
+        stack = ExitStack()
+        try:
+            self._server = _open_smtp_connection(
+                stack,
+                smtp_host=self.smtp_host,
+                smtp_port=self.smtp_port,
+                username=self.username,
+                password=self.password,
+                security=self.security,
+            )
+        except BaseException:
+            stack.close()
+            raise
+        self._stack = stack
+        self._last_used = time.monotonic()
+
+    def close(self) -> None:
+        """
+        Close the SMTP connection. Closing an already closed mailer is a no-op.
+        """
+        stack, self._stack, self._server = self._stack, None, None
+        if stack is not None:
+            try:
+                stack.close()
+            except smtplib.SMTPServerDisconnected:
+                pass  # Server already hung up; nothing left to close
+
+    def send(self, i_email: Email) -> None:
+        """
+        Send an Email object over the open connection.
+
+        Parameters
+        ----------
+        i_email
+            Email object containing the email content and attachments
+
+        Returns
+        -------
+        None
+        """
+        self.connect()
+        self._check_idle_connection()
+
+        # Servers that accept 8-bit bodies get non-ASCII text unencoded
+        # rather than base64-encoded, which is a third larger
+        eight_bit = self._server.has_extn("8bitmime")
+        msg = _build_mime_message(i_email, sender=self.username, eight_bit=eight_bit)
+        mail_options = ("BODY=8BITMIME",) if eight_bit else ()
+
+        # send_message serializes straight to bytes, skipping the str copy
+        # that msg.as_string() would make of every attachment
+        try:
+            self._server.send_message(
+                msg,
+                from_addr=self.username,
+                to_addrs=i_email.recipients,
+                mail_options=mail_options,
+            )
+        except smtplib.SMTPServerDisconnected:
+            # The message is not resent: a drop after the data phase can mean the
+            # server already accepted it, and a retry would deliver it twice.
+            # Dropping the dead connection lets the next send reconnect.
+            self.close()
+            raise
+        self._last_used = time.monotonic()
+
+    def _check_idle_connection(self) -> None:
+        # Servers drop idle sessions, so probe one that has sat unused for a while
+        # and reconnect up front rather than failing partway into the next message
+        if time.monotonic() - self._last_used < _IDLE_CHECK_SECONDS:
+            return
+        try:
+            code, _ = self._server.noop()
+        except smtplib.SMTPServerDisconnected:
+            code = None
+        if code != 250:
+            self.close()
+            self.connect()
+        self._last_used = time.monotonic()
+
+
+class GmailMailer(SMTPMailer):
+    """
+    A reusable Gmail connection for sending several Email objects.
+
+    This is an `SMTPMailer` preconfigured for Gmail's STARTTLS endpoint.
+
+    Parameters
+    ----------
+    username
+        Gmail account username for sending the email
+
+    password
+        Gmail app password
+
+    Examples
+    --------
+    ```python
+    with GmailMailer("user@gmail.com", "password123") as mailer:
+        for email in emails:
+            mailer.send(email)
+    ```
+    """
+
+    def __init__(self, username: str, password: str):
+        super().__init__(
+            smtp_host="smtp.gmail.com",
+            smtp_port=587,
+            username=username,
+            password=password,
+            security="tls",
+        )
+
+
+class SMTPPool:
+    """
+    A bounded pool of SMTP connections for sending many Email objects concurrently.
+
+    SMTP is sequential on a single connection, but several connections can upload
+    messages in parallel. `SMTPPool` keeps up to `max_connections` authenticated
+    connections open and hands them out to senders, retiring each connection after
+    `max_messages_per_conn` messages so long batches stay within provider limits.
+
+    Parameters
+    ----------
+    smtp_host
+        SMTP server hostname (e.g., "smtp.example.com")
+
+    smtp_port
+        SMTP server port (typically 587 for TLS, 465 for SSL, 25 for plain SMTP)
+
+    username
+        SMTP account username for authentication
+
+    password
+        SMTP account password
+
+    security
+        Security protocol to use: "tls" (STARTTLS), "ssl" (SSL/TLS), or "smtp" (plain SMTP).
+        Default is "tls".
+
+    max_connections
+        Maximum number of connections open at the same time. Default is 5.
+
+    max_messages_per_conn
+        Number of messages sent over a connection before it is closed and replaced.
+        Default is 100.
+
+    Raises
+    ------
+    ValueError
+        If security is not one of "tls", "ssl", or "smtp", or if either limit is below 1
+
+    Examples
+    --------
+    ```python
+    with SMTPPool("smtp.example.com", 587, "user@example.com", "password123") as pool:
+        pool.send_many(emails)
+    ```
+    """
+
+    def __init__(
+        self,
+        smtp_host: str,
+        smtp_port: int,
+        username: str,
+        password: str,
+        security: Literal["tls", "ssl", "smtp"] = "tls",
+        max_connections: int = 5,
+        max_messages_per_conn: int = 100,
+    ):
+        _check_security(security)
+        if max_connections < 1:
+            raise ValueError(f"max_connections must be at least 1, got {max_connections}")
+        if max_messages_per_conn < 1:
+            raise ValueError(
+                f"max_messages_per_conn must be at least 1, got {max_messages_per_conn}"
+            )
+
+        self.smtp_host = smtp_host
+        self.smtp_port = smtp_port
+        self.username = username
+        self.password = password
+        self.security = security
+        self.max_connections = max_connections
+        self.max_messages_per_conn = max_messages_per_conn
+
+        # Idle connections, stored with the number of messages they have sent
+        self._idle: queue.Queue[tuple[SMTPMailer, int]] = queue.Queue()
+        self._slots = threading.BoundedSemaphore(max_connections)
+
+    def __enter__(self) -> "SMTPPool":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @contextmanager
+    def acquire(self) -> Iterator[SMTPMailer]:
+        """
+        Borrow a connected `SMTPMailer` from the pool for one message.
+
+        Blocks while `max_connections` connections are in use. The connection is
+        returned to the pool on exit, or closed if it reached `max_messages_per_conn`
+        or the block raised.
+        """
+        with self._slots:
+            try:
+                mailer, sent = self._idle.get_nowait()
+            except queue.Empty:
+                mailer, sent = self._new_mailer(), 0
+
+            try:
+                yield mailer
+            except BaseException:
+                mailer.close()
+                raise
+
+            sent += 1
+            if sent >= self.max_messages_per_conn:
+                mailer.close()
+            else:
+                self._idle.put((mailer, sent))
+
+    def send(self, i_email: Email) -> None:
+        """
+        Send an Email object over a pooled connection.
+
+        Parameters
+        ----------
+        i_email
+            Email object containing the email content and attachments
+
+        Returns
+        -------
+        None
+        """
+        with self.acquire() as mailer:
+            mailer.send(i_email)
+
+    def send_many(self, emails: Iterable[Email]) -> None:
+        """
+        Send several Email objects concurrently, one thread per pooled connection.
+
+        Parameters
+        ----------
+        emails
+            Email objects to send
+
+        Returns
+        -------
+        None
+
+        Raises
+        ------
+        Exception
+            The first error raised while sending, after all other sends have finished
+        """
+        # Imported here since only batch sends need a thread pool
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=self.max_connections) as executor:
+            futures = [executor.submit(self.send, i_email) for i_email in emails]
+        for future in futures:
+            future.result()
+
+    def close(self) -> None:
+        """
+        Close all idle connections in the pool.
+        """
+        while True:
+            try:
+                mailer, _ = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            mailer.close()
+
+    def _new_mailer(self) -> SMTPMailer:
+        mailer = SMTPMailer(
+            smtp_host=self.smtp_host,
+            smtp_port=self.smtp_port,
+            username=self.username,
+            password=self.password,
+            security=self.security,
+        )
+        mailer.connect()
+        return mailer
+
+
+async def send_email_with_smtp_async(
+    smtp_host: str,
+    smtp_port: int,
+    username: str,
+    password: str,
+    i_email: Email,
+    security: Literal["tls", "ssl", "smtp"] = "tls",
+) -> None:
+    """
+    Send an Email object via SMTP from asyncio code.
+
+    This is the asyncio counterpart of `send_email_with_smtp()`: waiting on the
+    network does not block the event loop, so sends to different SMTP servers can
+    run concurrently with `asyncio.gather()`.
+
+    Parameters
+    ----------
+    smtp_host
+        SMTP server hostname (e.g., "smtp.example.com")
+
+    smtp_port
+        SMTP server port (typically 587 for TLS, 465 for SSL, 25 for plain SMTP)
+
+    username
+        SMTP account username for authentication
+
+    password
+        SMTP account password
+
+    i_email
+        Email object containing the email content and attachments
+
+    security
+        Security protocol to use: "tls" (STARTTLS), "ssl" (SSL/TLS), or "smtp" (plain SMTP).
+        Default is "tls".
+
+    Returns
+    -------
+    None
+        The function sends an email but doesn't return a value
+
+    Raises
+    ------
+    ValueError
+        If security parameter is not one of "tls", "ssl", or "smtp"
+
+    Examples
+    --------
+    ```python
+    await send_email_with_smtp_async(
+        "smtp.example.com",
+        587,
+        "user@example.com",
+        "password123",
+        email,
+    )
+    ```
+
+    Notes
+    -----
+    Requires the `aiosmtplib` package: `pip install aiosmtplib`
+    """
+    await send_emails_with_smtp_async(
+        smtp_host=smtp_host,
+        smtp_port=smtp_port,
+        username=username,
+        password=password,
+        emails=[i_email],
+        security=security,
+        max_connections=1,
+    )
+
+
+async def send_emails_with_smtp_async(
+    smtp_host: str,
+    smtp_port: int,
+    username: str,
+    password: str,
+    emails: Iterable[Email],
+    security: Literal["tls", "ssl", "smtp"] = "tls",
+    max_connections: int = 5,
+) -> None:
+    """
+    Send several Email objects concurrently via SMTP from asyncio code.
+
+    Up to `max_connections` connections are opened to the server, and each one sends
+    emails one after another until none are left. Emails for several SMTP servers can
+    be sent at the same time by gathering one call per server, each keeping to its own
+    connection limit.
+
+    Parameters
+    ----------
+    smtp_host
+        SMTP server hostname (e.g., "smtp.example.com")
+
+    smtp_port
+        SMTP server port (typically 587 for TLS, 465 for SSL, 25 for plain SMTP)
+
+    username
+        SMTP account username for authentication
+
+    password
+        SMTP account password
+
+    emails
+        Email objects to send
+
+    security
+        Security protocol to use: "tls" (STARTTLS), "ssl" (SSL/TLS), or "smtp" (plain SMTP).
+        Default is "tls".
+
+    max_connections
+        Maximum number of connections open to the server at the same time. Default is 5.
+
+    Returns
+    -------
+    None
+
+    Raises
+    ------
+    ValueError
+        If security is not one of "tls", "ssl", or "smtp", or if max_connections is below 1
+    Exception
+        The first error raised while sending, after all other sends have finished
+
+    Examples
+    --------
+    ```python
+    import asyncio
+
+    async def main():
+        await asyncio.gather(
+            send_emails_with_smtp_async("smtp.gmail.com", 587, gmail_user, gmail_pw, gmail_batch),
+            send_emails_with_smtp_async("relay.example.com", 587, relay_user, relay_pw, relay_batch),
+        )
+
+    asyncio.run(main())
+    ```
+
+    Notes
+    -----
+    Requires the `aiosmtplib` package: `pip install aiosmtplib`
+    """
+    import asyncio
+
+    import aiosmtplib
+
+    _check_security(security)
+    if max_connections < 1:
+        raise ValueError(f"max_connections must be at least 1, got {max_connections}")
+
+    emails = list(emails)
+    pending = iter(emails)
+
+    async def send_pending() -> None:
+        smtp = await _open_async_smtp_connection(
+            smtp_host, smtp_port, username, password, security
+        )
+        try:
+            # Coroutines only switch at awaits, so sharing the iterator is safe
+            for i_email in pending:
+                eight_bit = smtp.supports_extension("8bitmime")
+                msg = _build_mime_message(i_email, sender=username, eight_bit=eight_bit)
+                await smtp.send_message(
+                    msg,
+                    sender=username,
+                    recipients=i_email.recipients,
+                    mail_options=["BODY=8BITMIME"] if eight_bit else None,
+                )
+        finally:
+            try:
+                await smtp.quit()
+            except aiosmtplib.SMTPException:
+                smtp.close()
+
+    workers = [send_pending() for _ in range(min(max_connections, len(emails)))]
+    results = await asyncio.gather(*workers, return_exceptions=True)
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
+
+
+#### Helpers ####
+
+# 57 raw bytes encode to one 76-character base64 line
+_BASE64_CHUNK_SIZE = 57 * 16384
+
+# Leading bytes of the image formats email clients display inline; WebP files start
+# with RIFF and carry "WEBP" at offset 8
+_IMAGE_SIGNATURES = (
+    (b"\x89PNG\r\n\x1a\n", "png"),
+    (b"\xff\xd8\xff", "jpeg"),
+    (b"GIF87a", "gif"),
+    (b"GIF89a", "gif"),
+    (b"RIFF", "webp"),
+)
+
+# UTF-8 text parts without a transfer encoding, for servers that allow 8BITMIME
+_UTF8_8BIT = Charset("utf-8")
+_UTF8_8BIT.body_encoding = None
+_MAX_LINE_OCTETS = 998
+
+# Lines starting with a period are doubled in the DATA stream (RFC 5321 4.5.2)
+_LEADING_PERIOD_RE = re.compile(rb"(?m)^\.")
+
+# Connections idle for longer than this are checked with NOOP before reuse
+_IDLE_CHECK_SECONDS = 30.0
+
+
+def _check_security(security: str) -> None:
     if security not in ("tls", "ssl", "smtp"):
         raise ValueError(f"security must be 'tls', 'ssl', or 'smtp', got '{security}'")
 
-    # Compose the email
-    msg = MIMEMultipart("related")
-    msg["Subject"] = i_email.subject
-    msg["From"] = username
-    msg["To"] = ", ".join(i_email.recipients)  # Header must be a string
 
-    msg_alt = MIMEMultipart("alternative")
-    msg.attach(msg_alt)
-    msg_alt.attach(MIMEText(i_email.html, "html"))
+def _build_mime_message(
+    i_email: Email, sender: str, eight_bit: bool = False
+) -> MIMEBase:
+    """
+    Compose the MIME message sent by the SMTP senders.
+
+    Containers are only used when needed: without inline images or attachments the
+    message is just the multipart/alternative of HTML and text, or the HTML alone.
+
+    With `eight_bit`, non-ASCII text parts are sent as raw UTF-8 instead of base64;
+    only pass it when the server advertises 8BITMIME.
+    """
+    # email.mime is only loaded once a message is actually built
+    from email.mime.base import MIMEBase
+    from email.mime.multipart import MIMEMultipart
+
+    alt_parts = [_text_part(i_email.html, "html", eight_bit)]
 
     # Attach the plaintext
     if i_email.text:
-        msg_alt.attach(MIMEText(i_email.text, "plain"))
+        alt_parts.append(_text_part(i_email.text, "plain", eight_bit))
+
+    # Collect every part first and hand them to the container in one go
+    parts = [
+        MIMEMultipart("alternative", _subparts=alt_parts)
+        if len(alt_parts) > 1
+        else alt_parts[0]
+    ]
 
     # Attach inline images
     if i_email.inline_attachments:
-        for image_name, image_base64 in i_email.inline_attachments.items():
-            img_bytes = base64.b64decode(image_base64)
-            img = MIMEImage(img_bytes, _subtype="png", name=f"{image_name}")
-
-            img.add_header("Content-ID", f"<{image_name}>")
-            img.add_header("Content-Disposition", "inline", filename=f"{image_name}")
-
-            msg.attach(img)
+        parts.extend(_inline_image_parts(i_email))
 
     # Attach external files (any type)
     if i_email.external_attachments:
         for filename in i_email.external_attachments:
-            with open(filename, "rb") as f:
-                file_data = f.read()
-
             # Guess MIME type based on file extension
-            mime_type, _ = mimetypes.guess_type(filename)
-            if mime_type is None:
-                mime_type = "application/octet-stream"
-            main_type, sub_type = mime_type.split("/", 1)
+            main_type, sub_type = _guess_mime_type(os.path.splitext(filename)[1].lower())
 
             part = MIMEBase(main_type, sub_type)
-            part.set_payload(file_data)
-            encoders.encode_base64(part)
+            part.set_payload(_read_file_as_base64(filename))
+            part["Content-Transfer-Encoding"] = "base64"
             part.add_header("Content-Disposition", "attachment", filename=filename)
-            msg.attach(part)
+            parts.append(part)
+
+    if len(parts) > 1:
+        msg = MIMEMultipart("related", _subparts=parts)
+    elif len(alt_parts) > 1:
+        # Nothing to relate the text to, so the alternatives are the whole message
+        msg = parts[0]
+    else:
+        # HTML only: a single part, without any multipart boundaries
+        msg = alt_parts[0]
+
+    msg["Subject"] = i_email.subject
+    msg["From"] = sender
+    msg["To"] = ", ".join(i_email.recipients)  # Header must be a string
+
+    return msg
+
+
+def _inline_image_parts(i_email: Email) -> list[MIMEImage]:
+    """
+    Return the MIMEImage parts for an Email's inline attachments.
+
+    Parts are cached on the Email and reused by later sends, as long as the attachment
+    data is still the same object they were built from.
+    """
+    # The cache slot is unset until the Email is first sent
+    cached = getattr(i_email, "_inline_mime_parts", None) or {}
+    built = {}
+    for image_name, image_data in i_email.inline_attachments.items():
+        entry = cached.get(image_name)
+        if entry is None or entry[0] is not image_data:
+            entry = (image_data, _build_inline_image(image_name, image_data))
+        built[image_name] = entry
+
+    i_email._inline_mime_parts = built
+    return [img for _, img in built.values()]
+
+
+def _build_inline_image(image_name: str, image_data: str | bytes) -> MIMEImage:
+    from email.mime.image import MIMEImage
+
+    if isinstance(image_data, bytes):
+        img = MIMEImage(
+            image_data, _subtype=_sniff_image_subtype(image_data), name=f"{image_name}"
+        )
+    else:
+        # The image is already base64, so attach it as-is rather than
+        # decoding it only for MIMEImage to encode it again
+        img = MIMEImage(
+            _wrap_base64(image_data),
+            _subtype=_sniff_image_subtype(_decode_base64_head(image_data)),
+            _encoder=encode_noop,
+            name=f"{image_name}",
+        )
+        img["Content-Transfer-Encoding"] = "base64"
+
+    img.add_header("Content-ID", f"<{image_name}>")
+    img.add_header("Content-Disposition", "inline", filename=f"{image_name}")
+    return img
+
+
+def _sniff_image_subtype(head: bytes) -> str:
+    """Return the image subtype for the leading bytes of an image, defaulting to png."""
+    for signature, subtype in _IMAGE_SIGNATURES:
+        if head.startswith(signature):
+            if subtype == "webp" and head[8:12] != b"WEBP":
+                continue
+            return subtype
+    return "png"
+
+
+def _decode_base64_head(b64: str) -> bytes:
+    # 16 base64 characters decode to the first 12 bytes, enough for any signature
+    head = "".join(b64[:32].split())[:16]
+    try:
+        return base64.b64decode(head)
+    except ValueError:
+        return b""
+
+
+def _text_part(text: str, subtype: str, eight_bit: bool) -> MIMEText:
+    from email.mime.text import MIMEText
+
+    # 8-bit bodies still need lines of at most 998 octets (RFC 5321 4.5.3.1.6)
+    if eight_bit and not text.isascii():
+        lines = text.encode("utf-8").splitlines()
+        if max(map(len, lines), default=0) <= _MAX_LINE_OCTETS:
+            return MIMEText(text, subtype, _UTF8_8BIT)
+    return MIMEText(text, subtype)
+
+
+def _wrap_base64(b64: str) -> str:
+    """Split a base64 string into the 76-character lines required in MIME bodies."""
+    if "\n" in b64:
+        b64 = "".join(b64.split())
+    lines = [b64[i : i + 76] for i in range(0, len(b64), 76)]
+    lines.append("")
+    return "\n".join(lines)
+
+
+@lru_cache(maxsize=256)
+def _guess_mime_type(ext: str) -> tuple[str, str]:
+    """Return the (main type, subtype) pair for a file extension such as ".csv"."""
+    # Only senders with external attachments need mimetypes and its database, so
+    # both are loaded on the first lookup; the cache means that happens once per
+    # extension
+    import mimetypes
 
-    # Send via SMTP with appropriate security protocol
+    mime_type, _ = mimetypes.guess_type("file" + ext)
+    if mime_type is None:
+        mime_type = "application/octet-stream"
+    main_type, sub_type = mime_type.split("/", 1)
+    return main_type, sub_type
+
+
+def _read_file_as_base64(filename: str) -> str:
+    """
+    Base64-encode a file for a MIME body, as 76-character lines.
+
+    The file is read in chunks whose size is a multiple of 57 bytes, so each chunk
+    encodes to whole lines and the chunks can simply be concatenated. Only one raw
+    chunk is held at a time, but the encoded text of the whole file is collected
+    before it is joined.
+    """
+    chunks = []
+    with open(filename, "rb") as f:
+        while True:
+            block = f.read(_BASE64_CHUNK_SIZE)
+            if not block:
+                break
+            chunks.append(base64.encodebytes(block).decode("ascii"))
+
+    return "".join(chunks)
+
+
+class _SMTPTransferMixin:
+    """
+    Trim round-trips and copies from smtplib's message transfer.
+
+    smtplib waits for the reply to MAIL FROM and to every RCPT TO before sending the
+    next command, costing one network round-trip per recipient. When the server
+    advertises PIPELINING (RFC 2920), all envelope commands are written up front and
+    their replies are read back in order afterwards.
+
+    smtplib's `data` also concatenates the end-of-data marker onto the message,
+    copying the whole message (attachments included) twice; here it is sent on its
+    own instead. When the server advertises CHUNKING (RFC 3030), the message goes
+    out as a single `BDAT ... LAST` chunk, which needs neither the 354 round-trip
+    nor period quoting.
+
+    Nagle's algorithm is turned off on the socket: pipelined commands and the
+    separately sent end-of-data marker are small writes that would otherwise wait
+    on the server's delayed ACK.
+    """
+
+    def connect(self, host="localhost", port=0, source_address=None):
+        reply = super().connect(host, port, source_address)
+        try:
+            self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        except OSError:
+            pass  # not a TCP socket
+        return reply
+
+    def sendmail(self, from_addr, to_addrs, msg, mail_options=(), rcpt_options=()):
+        self.ehlo_or_helo_if_needed()
+        if not self.has_extn("pipelining") or not isinstance(msg, bytes):
+            return super().sendmail(from_addr, to_addrs, msg, mail_options, rcpt_options)
+
+        if isinstance(to_addrs, str):
+            to_addrs = [to_addrs]
+
+        esmtp_opts = list(mail_options)
+        if self.has_extn("size"):
+            esmtp_opts.insert(0, f"size={len(msg)}")
+        if any(opt.lower() == "smtputf8" for opt in esmtp_opts):
+            if not self.has_extn("smtputf8"):
+                raise smtplib.SMTPNotSupportedError("SMTPUTF8 not supported by server")
+            self.command_encoding = "utf-8"
+
+        mail_args = " ".join([f"FROM:{smtplib.quoteaddr(from_addr)}", *esmtp_opts])
+        self.putcmd("mail", mail_args)
+        for addr in to_addrs:
+            self.putcmd("rcpt", " ".join([f"TO:{smtplib.quoteaddr(addr)}", *rcpt_options]))
+
+        # Replies come back in the order the commands were sent
+        mail_code, mail_resp = self.getreply()
+        senderrs = {}
+        for addr in to_addrs:
+            code, resp = self.getreply()
+            if code not in (250, 251):
+                senderrs[addr] = (code, resp)
+
+        if mail_code != 250:
+            self._abort_transaction(mail_code)
+            raise smtplib.SMTPSenderRefused(mail_code, mail_resp, from_addr)
+        closing = any(code == 421 for code, _ in senderrs.values())
+        if closing or len(senderrs) == len(to_addrs):
+            self._abort_transaction(421 if closing else None)
+            raise smtplib.SMTPRecipientsRefused(senderrs)
+
+        code, resp = self.data(msg)
+        if code != 250:
+            self._abort_transaction(code)
+            raise smtplib.SMTPDataError(code, resp)
+
+        return senderrs
+
+    def data(self, msg):
+        if not isinstance(msg, bytes):
+            return super().data(msg)
+
+        if self.has_extn("chunking"):
+            return self._bdat(msg)
+
+        self.putcmd("data")
+        code, repl = self.getreply()
+        if code != 354:
+            raise smtplib.SMTPDataError(code, repl)
+
+        # sub() hands back the message itself when no line starts with a period
+        quoted = _LEADING_PERIOD_RE.sub(b"..", msg)
+        self.send(quoted)
+        self.send(b".\r\n" if quoted.endswith(b"\r\n") else b"\r\n.\r\n")
+        return self.getreply()
+
+    def _bdat(self, msg: bytes):
+        if not msg.endswith(b"\r\n"):
+            msg += b"\r\n"
+        # The chunk follows its command directly; only one reply comes back
+        self.send(f"BDAT {len(msg)} LAST\r\n".encode("ascii"))
+        self.send(msg)
+        return self.getreply()
+
+    def _abort_transaction(self, code: int | None) -> None:
+        # 421 means the server is closing the connection; otherwise reset the
+        # transaction so the connection can be reused
+        if code == 421:
+            self.close()
+            return
+        try:
+            self.rset()
+        except smtplib.SMTPServerDisconnected:
+            pass
+
+
+class _SMTP(_SMTPTransferMixin, smtplib.SMTP):
+    pass
+
+
+class _SMTP_SSL(_SMTPTransferMixin, smtplib.SMTP_SSL):
+    pass
+
+
+async def _open_async_smtp_connection(
+    smtp_host: str,
+    smtp_port: int,
+    username: str,
+    password: str,
+    security: str,
+):
+    """Open and authenticate an aiosmtplib connection, mirroring `_open_smtp_connection`."""
+    import aiosmtplib
+
+    if security == "smtp":
+        warnings.warn(
+            "You are sending email without encryption (plain SMTP). This is insecure and not recommended for production use.",
+            UserWarning,
+        )
+
+    smtp = aiosmtplib.SMTP(
+        hostname=smtp_host,
+        port=smtp_port,
+        use_tls=security == "ssl",
+        start_tls=security == "tls",
+    )
+    await smtp.connect()
+    try:
+        if security == "smtp":
+            # Try to login, but don't fail if server doesn't require it
+            try:
+                await smtp.login(username, password)
+            except aiosmtplib.SMTPException:
+                pass  # Test servers may not require authentication
+        else:
+            await smtp.login(username, password)
+    except BaseException:
+        smtp.close()
+        raise
+
+    return smtp
+
+
+def _open_smtp_connection(
+    stack: ExitStack,
+    smtp_host: str,
+    smtp_port: int,
+    username: str,
+    password: str,
+    security: str,
+) -> smtplib.SMTP:
+    """Open and authenticate an SMTP connection whose cleanup is registered on `stack`."""
     if security == "ssl":
         # Use SSL/TLS from the start (typically port 465)
-        with smtplib.SMTP_SSL(smtp_host, smtp_port) as server:
-            server.login(username, password)
-            server.sendmail(msg["From"], i_email.recipients, msg.as_string())
+        server = stack.enter_context(_SMTP_SSL(smtp_host, smtp_port))
+        server.login(username, password)
     elif security == "tls":
         # Use STARTTLS - start unencrypted then upgrade (typically port 587)
-        with smtplib.SMTP(smtp_host, smtp_port) as server:
-            server.starttls()
-            server.login(username, password)
-            server.sendmail(msg["From"], i_email.recipients, msg.as_string())
+        server = stack.enter_context(_SMTP(smtp_host, smtp_port))
+        server.starttls()
+        server.login(username, password)
     else:  # security == "smtp"
         warnings.warn(
             "You are sending email without encryption (plain SMTP). This is insecure and not recommended for production use.",
             UserWarning,
         )
         # Plain SMTP without encryption (insecure - for testing only)
-        with smtplib.SMTP(smtp_host, smtp_port) as server:
-            # Try to login, but don't fail if server doesn't require it
-            try:
-                server.login(username, password)
-            except smtplib.SMTPException:
-                pass  # Test servers may not require authentication
-            server.sendmail(msg["From"], i_email.recipients, msg.as_string())
+        server = stack.enter_context(_SMTP(smtp_host, smtp_port))
+        # Try to login, but don't fail if server doesn't require it
+        try:
+            server.login(username, password)
+        except smtplib.SMTPException:
+            pass  # Test servers may not require authentication
+
+    return server
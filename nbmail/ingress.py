@@ -1,15 +1,20 @@
 from __future__ import annotations
-from base64 import b64encode
 import json
 
 from email.message import EmailMessage
-from mjml import mjml2html
+from email.utils import getaddresses
 
 from .structs import Email
 from .mjml import MJMLTag
+from .mjml._core import _mjml_to_html
 from .mjml.image_processor import _process_mjml_images
 import warnings
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 __all__ = [
     "redmail_to_email",
     "yagmail_to_email",
@@ -75,7 +80,7 @@ def mjml_to_email(
         mjml_markup = mjml_content
         inline_attachments = {}
 
-    email_content = mjml2html(mjml_markup)
+    email_content = _mjml_to_html(mjml_markup)
 
     i_email = Email(
         html=email_content,
@@ -109,47 +114,43 @@ def _email_message_to_email(msg: EmailMessage) -> Email:
     # Extract recipients (To, Cc, Bcc)
     # Recipients get flattened to one list.
     # TODO: Maybe in the future we keep these 3 separate?
-    recipients = []
+    # getaddresses parses all three headers in one go and copes with display
+    # names that contain commas, e.g. "Doe, Jane" <jane@example.com>
+    header_values = []
     for header in ["To", "Cc", "Bcc"]:
-        value = msg.get(header)
-        if value:
-            recipients += [addr.strip() for addr in value.split(",") if addr.strip()]
+        header_values += msg.get_all(header, [])
+    recipients = [addr for _, addr in getaddresses(header_values) if addr]
     recipients = recipients if recipients else None
 
-    # Extract HTML and plain text bodies
+    # Extract HTML and plain text bodies, inline attachments (images with
+    # Content-ID) and external attachments in a single walk over the MIME tree
     html = None
     text = None
-
-    if msg.is_multipart():
-        for part in msg.walk():
-            ctype = part.get_content_type()
-            disp = part.get_content_disposition()
-            if ctype == "text/html" and disp != "attachment":
-                html = part.get_content()
-            elif ctype == "text/plain" and disp != "attachment":
-                text = part.get_content()
-    else:
-        ctype = msg.get_content_type()
-        if ctype == "text/html":
-            html = msg.get_content()
-        elif ctype == "text/plain":
-            text = msg.get_content()
-
-    # Extract inline attachments (images with Content-ID)
     inline_attachments = {}
     external_attachments = []
-    for part in msg.iter_attachments():
-        filename = part.get_filename()
+
+    for part in msg.walk():
+        if part.is_multipart():
+            continue
+
+        ctype = part.get_content_type()
+        disp = part.get_content_disposition()
         content_id = part.get("Content-ID")
-        payload = part.get_payload(decode=True)
-        if content_id:
+        is_body = disp != "attachment" and not content_id
+
+        if is_body and ctype == "text/html":
+            html = part.get_content()
+        elif is_body and ctype == "text/plain":
+            text = part.get_content()
+        elif content_id:
             cid = content_id.strip("<>")
-            # Store as base64 string
-            inline_attachments[cid] = b64encode(payload).decode("utf-8")
-        elif filename:
-            # Save filename for external attachments
-            # Not certain that all attached files have associated filenames
-            external_attachments.append(filename)
+            inline_attachments[cid] = _inline_payload(part)
+        else:
+            filename = part.get_filename()
+            if filename:
+                # Save filename for external attachments
+                # Not certain that all attached files have associated filenames
+                external_attachments.append(filename)
 
     return Email(
         html=html or "",
@@ -161,6 +162,21 @@ def _email_message_to_email(msg: EmailMessage) -> Email:
     )
 
 
+def _inline_payload(part: EmailMessage) -> str | bytes:
+    """
+    Return a MIME part's payload in the cheapest form `Email.inline_attachments` accepts.
+
+    Parts sent with a base64 transfer encoding already hold the base64 text, so it is
+    reused with the line breaks removed instead of being decoded and encoded again.
+    Any other part is kept as its decoded bytes rather than encoded to base64 here
+    only for the senders to decode it again.
+    """
+    if part.get("Content-Transfer-Encoding", "").strip().lower() == "base64":
+        return "".join(part.get_payload().split())
+
+    return part.get_payload(decode=True)
+
+
 # Helper method to parse the quarto JSON
 def quarto_json_to_email(path: str) -> Email:
     """
@@ -172,8 +188,7 @@ def quarto_json_to_email(path: str) -> Email:
         Path to the Quarto output metadata JSON file
 
     """
-    with open(path, "r", encoding="utf-8") as f:
-        metadata = json.load(f)
+    metadata = _read_json(path)
 
     # Support both rsc_-prefixed (Quarto standard) and non-prefixed formats
     email_html = metadata.get("rsc_email_body_html", metadata.get("email_body_html", ""))
@@ -217,3 +232,18 @@ def quarto_json_to_email(path: str) -> Email:
     )
 
     return i_email
+
+
+def _read_json(path: str) -> dict:
+    """
+    Read a JSON file, using orjson when it is installed.
+
+    Quarto metadata files embed every inline image as base64, so they can be large.
+    The file is read as bytes and parsed in one call, letting orjson decode UTF-8 in C.
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
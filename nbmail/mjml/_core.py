@@ -3,10 +3,10 @@
 ## TODO: make sure Ending tags are rendered as needed
 # https://documentation.mjml.io/#ending-tags
 
+from functools import lru_cache
 from typing import Dict, Mapping, Optional, Sequence, Union
 import warnings
 from io import BytesIO
-from mjml import mjml2html
 
 
 # Types for MJML
@@ -23,19 +23,15 @@ class TagAttrDict(Dict[str, Union[str, bytes, BytesIO]]):
 
     def __init__(self, *args: Mapping[str, TagAttrValue]) -> None:
         super().__init__()
-        for mapping in args:
-            for k, v in mapping.items():
-                if v is not None:
-                    # Preserve bytes and BytesIO objects as-is for image processing
-                    if isinstance(v, (bytes, BytesIO)):
-                        self[k] = v
-                    else:
-                        self[k] = str(v)
+        self.update(*args)
 
     def update(self, *args: Mapping[str, TagAttrValue]) -> None:
         for mapping in args:
             for k, v in mapping.items():
-                if v is not None:
+                # Most values are strings already and are stored without a str() call
+                if type(v) is str:
+                    self[k] = v
+                elif v is not None:
                     # Preserve bytes and BytesIO objects as-is for image processing
                     if isinstance(v, (bytes, BytesIO)):
                         self[k] = v
@@ -43,11 +39,28 @@ class TagAttrDict(Dict[str, Union[str, bytes, BytesIO]]):
                         self[k] = str(v)
 
 
+def _flatten_into(out: list, items) -> None:
+    """
+    Append tags and text from arbitrarily nested sequences to `out`, dropping `None`.
+    """
+    for item in items:
+        if isinstance(item, (MJMLTag, str, float)):
+            out.append(item)
+        elif isinstance(item, (list, tuple)):
+            _flatten_into(out, item)
+        elif item is not None and isinstance(item, Sequence):
+            # The ABC check is slower, so it is left for less common sequence types
+            _flatten_into(out, item)
+
+
 class MJMLTag:
     """
     MJML tag class.
     """
 
+    # Trees can hold many tags; slots drop the per-instance __dict__
+    __slots__ = ("tagName", "attrs", "children", "content", "_is_leaf")
+
     def __init__(
         self,
         tagName: str,
@@ -57,7 +70,6 @@ class MJMLTag:
         _is_leaf: bool = False,
     ) -> None:
         self.tagName = tagName
-        self.attrs = TagAttrDict()
         self.children = []
         self._is_leaf = _is_leaf
 
@@ -91,8 +103,9 @@ class MJMLTag:
                 )
 
             # Process attributes
-            if attributes is not None:
-                self.attrs.update(attributes)
+            self.attrs = (
+                TagAttrDict(attributes) if attributes is not None else TagAttrDict()
+            )
         else:
             # For container tags
             self.content = content
@@ -106,20 +119,14 @@ class MJMLTag:
                     f"If you meant to pass children, use positional arguments for container tags."
                 )
 
-            # Collect children (for non-leaf tags only)
-            for arg in args:
-                if (
-                    isinstance(arg, (str, float))
-                    or arg is None
-                    or isinstance(arg, MJMLTag)
-                ):
-                    self.children.append(arg)
-                elif isinstance(arg, Sequence) and not isinstance(arg, str):
-                    self.children.extend(arg)
+            # Collect children (for non-leaf tags only), flattened once here so
+            # rendering never has to
+            _flatten_into(self.children, args)
 
             # Process attributes
-            if attributes is not None:
-                self.attrs.update(attributes)
+            self.attrs = (
+                TagAttrDict(attributes) if attributes is not None else TagAttrDict()
+            )
 
         # TODO: confirm if this is the case... I don't think it is
         # # If content is provided, children should be empty
@@ -134,16 +141,75 @@ class MJMLTag:
         Note: BytesIO/bytes in image src attributes are not supported by _to_mjml().
         Pass the MJMLTag directly to mjml_to_email() instead.
         """
+        buf = []
+        self._render_into(buf, indent, eol)
+        return "".join(buf)
 
-        def _flatten(children):
-            for c in children:
-                if c is None:
-                    continue
-                elif isinstance(c, MJMLTag):
-                    yield c
-                elif isinstance(c, (str, float)):
-                    yield c
+    def _render_into(self, buf: list, indent: int, eol: str) -> None:
+        """
+        Append the markup for this tag and its children to `buf`.
+
+        The whole tree shares one buffer, so each fragment is copied into the
+        output once instead of once per enclosing tag. The tree is walked with an
+        explicit stack rather than recursion, so nesting depth is not bounded by
+        the interpreter's recursion limit.
+        """
+        pad = " " * indent
+        if not self._open_into(buf, pad, eol):
+            return
+
+        # Enclosing tags whose children are still being written
+        stack = []
+        tag, children = self, iter(self.children)
+        # The line break after the opening tag is only written once the tag turns
+        # out to have inner content, so its slot is filled in on close
+        open_eol, has_inner, sep = len(buf) - 1, False, ""
+
+        while True:
+            for child in children:
+                if isinstance(child, MJMLTag):
+                    buf.append(sep)
+                    sep = eol
+                    has_inner = True
+                    child_pad = pad + "  "
+                    if child._open_into(buf, child_pad, eol):
+                        stack.append((tag, pad, children, open_eol, has_inner, sep))
+                        tag, pad, children = child, child_pad, iter(child.children)
+                        open_eol, has_inner, sep = len(buf) - 1, False, ""
+                        break
+                else:
+                    # Text children are usually str already; only floats need converting
+                    if isinstance(child, str):
+                        text = child
+                    elif isinstance(child, float):
+                        text = str(child)
+                    else:
+                        continue
+                    buf.append(sep)
+                    buf.append(text)
+                    has_inner = has_inner or bool(sep or text)
+                    sep = eol
+            else:
+                # All children written: close the tag and resume its parent
+                if has_inner:
+                    buf[open_eol] = eol
+                    buf.append(eol)
+                    buf.append(pad)
+                buf.append("</")
+                buf.append(tag.tagName)
+                buf.append(">")
+                if not stack:
+                    return
+                tag, pad, children, open_eol, has_inner, sep = stack.pop()
+
+    def _open_into(self, buf: list, pad: str, eol: str) -> bool:
+        """
+        Append the opening tag to `buf`, or the whole tag if it has no children.
 
+        Returns True when the tag was left open for its children to be written,
+        with an empty placeholder as the last item of `buf` for the line break that
+        follows the opening tag.
+        """
         # Check for BytesIO/bytes in mj-image tags and raise clear error
         if self.tagName == "mj-image" and "src" in self.attrs:
             src_value = self.attrs["src"]
@@ -154,31 +220,35 @@ class MJMLTag:
                     "Example: email = mjml_to_email(doc)"
                 )
 
-        # Build attribute string
-        attr_str = ""
-        if self.attrs:
-            attr_str = " " + " ".join(f'{k}="{v}"' for k, v in self.attrs.items())
-
-        # Render children/content
-        inner = ""
-        if self.content is not None:
-            inner = str(self.content)
-        else:
-            child_strs = []
-            for child in _flatten(self.children):
-                if isinstance(child, MJMLTag):
-                    child_strs.append(child._to_mjml(indent + 2, eol))
-                else:
-                    child_strs.append(str(child))
-            if child_strs:
-                inner = eol.join(child_strs)
+        buf.append(pad)
+        buf.append("<")
+        buf.append(self.tagName)
+        for k, v in self.attrs.items():
+            if not isinstance(v, str):
+                v = str(v)
+            # A bare double quote would end the attribute early; values rarely
+            # contain one, so the scan is all most of them pay
+            if '"' in v:
+                v = v.replace('"', "&quot;")
+            buf.append(f' {k}="{v}"')
+
+        # Leaf fast path: content is known up front, so there is nothing to
+        # iterate and no need to defer the line break after the opening tag
+        if self.content is not None or not self.children:
+            inner = self.content
+            if inner is None:
+                inner = ""
+            elif not isinstance(inner, str):
+                inner = str(inner)
+            if inner:
+                buf.extend((">", eol, inner, eol, pad, "</", self.tagName, ">"))
+            else:
+                buf.extend(("></", self.tagName, ">"))
+            return False
 
-        # Indentation
-        pad = " " * indent
-        if inner:
-            return f"{pad}<{self.tagName}{attr_str}>{eol}{inner}{eol}{pad}</{self.tagName}>"
-        else:
-            return f"{pad}<{self.tagName}{attr_str}></{self.tagName}>"
+        buf.append(">")
+        buf.append("")
+        return True
 
     def _repr_html_(self):
         from ..ingress import mjml_to_email
@@ -256,4 +326,26 @@ class MJMLTag:
         """
         wrapped = self._wrap_in_mjml_tag(emit_warning=True)
         mjml_markup = wrapped._to_mjml()
-        return mjml2html(mjml_markup, **mjml2html_kwargs)
+
+        try:
+            hash(tuple(mjml2html_kwargs.values()))
+        except TypeError:
+            # Options such as a list of custom fonts can't key the cache
+            from mjml import mjml2html
+
+            return mjml2html(mjml_markup, **mjml2html_kwargs)
+
+        return _mjml_to_html(mjml_markup, **mjml2html_kwargs)
+
+
+@lru_cache(maxsize=32)
+def _mjml_to_html(mjml_markup: str, **mjml2html_kwargs) -> str:
+    """
+    Compile MJML markup to HTML, reusing the result for identical markup and options.
+
+    mjml is imported on first use so that importing nbmail stays cheap for
+    workflows that never render MJML.
+    """
+    from mjml import mjml2html
+
+    return mjml2html(mjml_markup, **mjml2html_kwargs)
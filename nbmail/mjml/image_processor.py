@@ -7,14 +7,16 @@ attachments for email embedding without using globals.
 
 from __future__ import annotations
 from typing import Any, Dict, Tuple
-import base64
-import uuid
+import hashlib
 from io import BytesIO
 
 from ._core import MJMLTag
 
 __all__ = []
 
+# Image sources that are converted to inline attachments
+_BINARY_TYPES = (bytes, BytesIO)
+
 
 def _convert_to_bytes(obj: Any) -> bytes:
     """
@@ -47,16 +49,16 @@ def _convert_to_bytes(obj: Any) -> bytes:
     )
 
 
-def _process_mjml_images(mjml_tag: MJMLTag) -> Tuple[MJMLTag, Dict[str, str]]:
+def _process_mjml_images(mjml_tag: MJMLTag) -> Tuple[MJMLTag, Dict[str, bytes]]:
     """
     Extract inline attachments from MJML tree and convert bytes/BytesIO to CID references.
     
     This is a private function. Users should not call it directly.
     It is called automatically by mjml_to_email().
     
-    This function recursively walks through the MJML tag tree and finds mj-image tags
+    This function walks through the MJML tag tree and finds mj-image tags
     with BytesIO or bytes in their src attribute. It converts these to CID references
-    and extracts the base64 data for the inline_attachments dictionary.
+    and extracts the raw image data for the inline_attachments dictionary.
     
     Parameters
     ----------
@@ -65,10 +67,10 @@ def _process_mjml_images(mjml_tag: MJMLTag) -> Tuple[MJMLTag, Dict[str, str]]:
         
     Returns
     -------
-    Tuple[MJMLTag, Dict[str, str]]
+    Tuple[MJMLTag, Dict[str, bytes]]
         A tuple of:\n
         - The modified MJML tag tree with BytesIO/bytes converted to CID references
-        - Dictionary mapping CID filenames to base64-encoded image data
+        - Dictionary mapping CID filenames to raw image bytes
         
     Examples
     --------
@@ -114,64 +116,78 @@ def _process_mjml_images(mjml_tag: MJMLTag) -> Tuple[MJMLTag, Dict[str, str]]:
     mjml_to_email(email)
     ```
     """
-    inline_attachments: Dict[str, str] = {}
+    inline_attachments: Dict[str, bytes] = {}
     
-    def _process_tag(tag: MJMLTag) -> MJMLTag:
-        """Recursively process a tag and its children."""
-        
+    def _image_attrs(tag: MJMLTag) -> Dict[str, Any] | None:
+        """
+        Return a copy of an mj-image tag's attrs pointing at a CID reference, or None
+        if the tag has no BytesIO/bytes image to convert.
+        """
         # Handle mj-image tags with BytesIO/bytes in src attribute
-        if tag.tagName == "mj-image" and "src" in tag.attrs:
-            src_value = tag.attrs["src"]
-            
-            # Check if src is BytesIO or bytes
-            if isinstance(src_value, (bytes, BytesIO)):
-                # Convert to bytes and encode to base64
-                image_bytes_data = _convert_to_bytes(src_value)
-                b64_string = base64.b64encode(image_bytes_data).decode("utf-8")
-                
-                # Generate CID filename using UUID
-                cid_id = uuid.uuid4().hex[:8]
-                cid_filename = f"plot_{cid_id}.png"
-                
-                # Store in attachments
-                inline_attachments[cid_filename] = b64_string
-                
-                # Create new tag with CID reference instead of BytesIO
-                new_attrs = dict(tag.attrs)
-                new_attrs["src"] = f"cid:{cid_filename}"
+        if tag.tagName != "mj-image" or "src" not in tag.attrs:
+            return None
+
+        src_value = tag.attrs["src"]
+
+        # Check if src is BytesIO or bytes
+        if not isinstance(src_value, _BINARY_TYPES):
+            return None
+
+        # Keep the raw bytes; base64 encoding is left to whichever
+        # output needs it, so each image is encoded at most once
+        image_bytes_data = _convert_to_bytes(src_value)
+
+        # Derive the CID filename from the image content, so rendering the same
+        # tree again produces the same markup (and hits the compiled HTML cache)
+        cid_id = hashlib.blake2b(image_bytes_data, digest_size=8).hexdigest()
+        cid_filename = f"plot_{cid_id}.png"
+
+        # Store in attachments
+        inline_attachments[cid_filename] = image_bytes_data
+
+        # Point the copy at the CID reference instead of BytesIO
+        new_attrs = dict(tag.attrs)
+        new_attrs["src"] = f"cid:{cid_filename}"
+        return new_attrs
+
+    # Walk the tree in post-order with an explicit stack rather than recursion, so
+    # deeply nested trees cannot exceed the interpreter's recursion limit. Each
+    # frame is [tag, children iterator, new attrs, new children, current index].
+    #
+    # Only tags on the path to a converted image are copied; any subtree without
+    # one is shared with the input tree, which is left intact. Children are
+    # copied into a new list only once one of them changes.
+    stack = [[mjml_tag, enumerate(mjml_tag.children), _image_attrs(mjml_tag), None, -1]]
+    while True:
+        frame = stack[-1]
+        for i, child in frame[1]:
+            if isinstance(child, MJMLTag):
+                frame[4] = i
+                stack.append(
+                    [child, enumerate(child.children), _image_attrs(child), None, -1]
+                )
+                break
+        else:
+            tag, _, new_attrs, new_children, _ = stack.pop()
+
+            if new_attrs is None and new_children is None:
+                new_tag = tag
+            else:
                 new_tag = MJMLTag(
                     tag.tagName,
-                    attributes=new_attrs,
+                    attributes=new_attrs if new_attrs is not None else tag.attrs,
                     content=tag.content,
-                    _is_leaf=tag._is_leaf
+                    _is_leaf=tag._is_leaf,
                 )
-                
-                # Process children
-                for child in tag.children:
-                    if isinstance(child, MJMLTag):
-                        new_tag.children.append(_process_tag(child))
-                    else:
-                        new_tag.children.append(child)
-                
-                return new_tag
-        
-        # For all other tags, process recursively
-        new_tag = MJMLTag(
-            tag.tagName,
-            attributes=dict(tag.attrs),
-            content=tag.content,
-            _is_leaf=tag._is_leaf
-        )
-        
-        for child in tag.children:
-            if isinstance(child, MJMLTag):
-                new_tag.children.append(_process_tag(child))
-            else:
-                new_tag.children.append(child)
-        
-        return new_tag
-    
-    # Process the entire tag tree
-    processed_tag = _process_tag(mjml_tag)
-    
-    return processed_tag, inline_attachments
+                new_tag.children = (
+                    new_children if new_children is not None else list(tag.children)
+                )
+
+            if not stack:
+                return new_tag, inline_attachments
+
+            if new_tag is not tag:
+                parent = stack[-1]
+                if parent[3] is None:
+                    parent[3] = list(parent[0].children)
+                parent[3][parent[4]] = new_tag
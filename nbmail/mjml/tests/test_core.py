@@ -28,6 +28,28 @@ def test_update_method():
     assert attrs["padding"] == "10px"
 
 
+def test_copy_from_tag_attr_dict():
+    image_data = b"fake png data"
+    original = TagAttrDict({"width": 100, "src": image_data})
+    attrs = TagAttrDict(original)
+
+    assert attrs == {"width": "100", "src": image_data}
+    assert attrs is not original
+
+    attrs["width"] = "200"
+    assert original["width"] == "100"
+
+
+def test_copy_from_tag_attr_dict_drops_assigned_none():
+    attrs = TagAttrDict({"width": "1"})
+    attrs["height"] = None
+
+    tag = MJMLTag("mj-image", attributes=attrs)
+
+    assert "height" not in tag.attrs
+    assert "height" not in tag._to_mjml()
+
+
 def test_tag_with_dict_attributes():
     attrs_dict = {"background-color": "#fff", "padding": "20px"}
     tag = MJMLTag("mj-section", attributes=attrs_dict)
@@ -36,6 +58,12 @@ def test_tag_with_dict_attributes():
     assert tag.attrs["padding"] == "20px"
 
 
+def test_tag_has_no_instance_dict():
+    tag = MJMLTag("mj-text", content="Hi", _is_leaf=True)
+
+    assert not hasattr(tag, "__dict__")
+
+
 def test_tag_filters_none_children():
     tag = MJMLTag("mj-column", MJMLTag("mj-text", content="Text"), None)
     mjml_content = tag._to_mjml()
@@ -56,6 +84,15 @@ def test_render_with_attributes():
     assert mjml_content == '<mj-spacer height="20px"></mj-spacer>'
 
 
+def test_render_escapes_double_quotes_in_attributes():
+    tag = MJMLTag("mj-button", content="Go", attributes={"href": 'a?q="hi"&x=1'})
+
+    assert tag._to_mjml() == (
+        '<mj-button href="a?q=&quot;hi&quot;&x=1">\nGo\n</mj-button>'
+    )
+    assert 'href="a?q=&quot;hi&quot;&x=1"' in MJMLTag("mjml", MJMLTag("mj-body", tag)).to_html()
+
+
 def test_render_with_custom_indent():
     tag = MJMLTag("mj-text", content="Hello")
     mjml_content = tag._to_mjml(indent=4)
@@ -90,6 +127,44 @@ def test_render_with_string_and_tag_children():
     assert "More text" in mjml_content
 
 
+def test_render_nested_layout():
+    tag = MJMLTag(
+        "mj-section",
+        MJMLTag(
+            "mj-column",
+            MJMLTag("mj-text", content="Hi", attributes={"align": "left"}),
+            "Plain",
+            MJMLTag("mj-spacer"),
+        ),
+        MJMLTag("mj-column", ""),
+        attributes={"padding": "0"},
+    )
+
+    assert tag._to_mjml() == (
+        '<mj-section padding="0">\n'
+        "  <mj-column>\n"
+        '    <mj-text align="left">\n'
+        "Hi\n"
+        "    </mj-text>\n"
+        "Plain\n"
+        "    <mj-spacer></mj-spacer>\n"
+        "  </mj-column>\n"
+        "  <mj-column></mj-column>\n"
+        "</mj-section>"
+    )
+
+
+def test_render_deeply_nested_tags():
+    tag = MJMLTag("mj-text", content="Deep")
+    for _ in range(3000):
+        tag = MJMLTag("mj-wrapper", tag)
+
+    mjml_content = tag._to_mjml(eol="")
+
+    assert mjml_content.count("<mj-wrapper>") == 3000
+    assert mjml_content.endswith("</mj-wrapper>")
+
+
 def test_repr_returns_simple_string():
     tag = MJMLTag("mj-text", content="Hello")
 
@@ -139,6 +214,22 @@ def test_to_html_passes_kwargs_to_mjml2html():
     assert "html" in result
 
 
+def test_to_html_reuses_compiled_html():
+    from nbmail.mjml._core import _mjml_to_html
+
+    tag = MJMLTag("mjml", MJMLTag("mj-body", MJMLTag("mj-section")))
+    _mjml_to_html.cache_clear()
+
+    first = tag.to_html(disable_comments=True)
+    second = tag.to_html(disable_comments=True)
+    third = tag.to_html()
+
+    assert first == second
+    assert "html" in third
+    info = _mjml_to_html.cache_info()
+    assert (info.hits, info.misses) == (1, 2)
+
+
 def test_leaf_tag_raises_on_children():
     with pytest.raises(TypeError, match="is a leaf tag and accepts only one positional argument"):
         MJMLTag("mj-text", "content", MJMLTag("mj-column"), _is_leaf=True)
@@ -177,6 +268,17 @@ def test_children_sequence_flattening():
     assert "Text 3" in mjml_content
 
 
+def test_children_nested_sequences_flattened_at_construction():
+    child1 = MJMLTag("mj-text", content="Text 1")
+    child2 = MJMLTag("mj-text", content="Text 2")
+    child3 = MJMLTag("mj-text", content="Text 3")
+
+    tag = MJMLTag("mj-column", [child1, None, (child2, [child3])], None, "tail")
+
+    assert tag.children == [child1, child2, child3, "tail"]
+    assert tag._to_mjml().count("<mj-text>") == 3
+
+
 def test_to_mjml_raises_on_bytesio_in_image_src():
     image_data = BytesIO(b"fake image data")
     image_tag = MJMLTag(
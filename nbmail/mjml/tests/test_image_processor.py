@@ -52,8 +52,7 @@ def test_process_mjml_images_with_bytesio():
     cid_filename = list(inline_attachments.keys())[0]
     assert cid_filename.startswith("plot_") and cid_filename.endswith(".png")
     assert processed_tag.attrs["src"] == f"cid:{cid_filename}"
-    assert isinstance(inline_attachments[cid_filename], str)
-    assert len(inline_attachments[cid_filename]) > 0
+    assert inline_attachments[cid_filename] == image_data
 
 
 def test_process_mjml_images_with_bytes():
@@ -72,8 +71,7 @@ def test_process_mjml_images_with_bytes():
     cid_filename = list(inline_attachments.keys())[0]
     assert cid_filename.startswith("plot_") and cid_filename.endswith(".png")
     assert processed_tag.attrs["src"] == f"cid:{cid_filename}"
-    assert isinstance(inline_attachments[cid_filename], str)
-    assert len(inline_attachments[cid_filename]) > 0
+    assert inline_attachments[cid_filename] == image_data
 
 
 def test_process_mjml_images_multiple_images():
@@ -100,6 +98,21 @@ def test_process_mjml_images_multiple_images():
     assert children_with_images[1].attrs["src"] == f"cid:{cid_filenames[1]}"
 
 
+def test_process_mjml_images_cids_are_deterministic():
+    col = MJMLTag(
+        "mj-column",
+        MJMLTag("mj-image", attributes={"src": BytesIO(b"fake png data 1")}),
+        MJMLTag("mj-image", attributes={"src": b"fake png data 2"}),
+    )
+
+    first_tag, first_attachments = _process_mjml_images(col)
+    second_tag, second_attachments = _process_mjml_images(col)
+
+    assert len(first_attachments) == 2
+    assert first_attachments == second_attachments
+    assert first_tag._to_mjml() == second_tag._to_mjml()
+
+
 def test_process_mjml_images_preserves_other_attributes():
     image_data = b"fake png data"
     
@@ -146,3 +159,43 @@ def test_process_mjml_images_preserves_non_image_tags():
     assert column.children[1].tagName == "mj-image"
     cid_filename = list(inline_attachments.keys())[0]
     assert column.children[1].attrs["src"] == f"cid:{cid_filename}"
+
+
+def test_process_mjml_images_shares_untouched_subtrees():
+    plain_column = MJMLTag("mj-column", MJMLTag("mj-text", content="Hello"))
+    image_tag = MJMLTag("mj-image", attributes={"src": b"data", "alt": "Img"})
+    section = MJMLTag("mj-section", plain_column, MJMLTag("mj-column", image_tag))
+
+    processed_tag, inline_attachments = _process_mjml_images(section)
+
+    assert len(inline_attachments) == 1
+    assert processed_tag is not section
+    assert processed_tag.children[0] is plain_column
+    assert processed_tag.children[1] is not section.children[1]
+
+    # The input tree still holds the original bytes
+    assert image_tag.attrs["src"] == b"data"
+
+
+def test_process_mjml_images_without_images_returns_input():
+    section = MJMLTag("mj-section", MJMLTag("mj-column", MJMLTag("mj-text", content="Hi")))
+
+    processed_tag, inline_attachments = _process_mjml_images(section)
+
+    assert processed_tag is section
+    assert inline_attachments == {}
+
+
+def test_process_mjml_images_deeply_nested_tags():
+    image_tag = MJMLTag("mj-image", attributes={"src": b"data", "alt": "Img"})
+    tag = image_tag
+    for _ in range(3000):
+        tag = MJMLTag("mj-wrapper", tag)
+
+    processed_tag, inline_attachments = _process_mjml_images(tag)
+
+    assert len(inline_attachments) == 1
+    for _ in range(3000):
+        processed_tag = processed_tag.children[0]
+    cid_filename = list(inline_attachments.keys())[0]
+    assert processed_tag.attrs["src"] == f"cid:{cid_filename}"
@@ -1,22 +1,56 @@
 from __future__ import annotations
+import base64
 from dataclasses import dataclass, field
 from functools import partial
-from http.server import HTTPServer, SimpleHTTPRequestHandler
 from pathlib import Path
 import re
 import json
+import sys
 
 from email.message import EmailMessage
-import tempfile
-import webbrowser
+from typing import TYPE_CHECKING
 
-from .utils import _add_base_64_to_inline_attachments
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if TYPE_CHECKING:
+    from http.server import HTTPServer
+
+from .utils import (
+    _CID_SRC_RE,
+    _add_base_64_to_inline_attachments,
+    _inline_attachment_data_uri,
+    _write_inlined_html,
+)
 
 __all__ = ["Email"]
 
+_WRITE_BUFFER_SIZE = 1 << 20
+
+# Drop the per-instance __dict__ where dataclasses support it (Python 3.10+)
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+# Up to this many inline images, each cid reference is swapped with str.replace;
+# beyond it a single regex pass over the HTML is cheaper than one scan per image
+_STR_REPLACE_MAX_CIDS = 16
+
+_BODY_OPEN_RE = re.compile(r"<body[^>]*>", flags=re.IGNORECASE)
+_BODY_CONTENT_RE = re.compile(r"<body[^>]*>(.*?)</body>", flags=re.DOTALL | re.IGNORECASE)
+_HTML_TAG_RE = re.compile(r"</?html[^>]*>", flags=re.IGNORECASE)
+
 
-@dataclass
-class Email:
+class _EmailSendCache:
+    # MIME parts the SMTP senders built from inline_attachments, kept so sending the
+    # same Email again reuses them; maps filename to (attachment data, MIMEImage).
+    # This lives in a slot of a plain base class rather than a dataclass field, so
+    # fields(), asdict() and comparisons never see it
+    __slots__ = ("_inline_mime_parts",)
+
+
+@dataclass(**_DATACLASS_SLOTS)
+class Email(_EmailSendCache):
     """
     A serializable, previewable, sendable email object for data science workflows.
 
@@ -36,7 +70,10 @@ class Email:
         List of file paths for external attachments to include.
 
     inline_attachments
-        Dictionary mapping filenames to base64-encoded strings for inline attachments.
+        Dictionary mapping filenames to inline attachments, given either as
+        base64-encoded strings or as raw `bytes`. The base64 text is sent as-is when
+        emailing via SMTP, so images read from Quarto output are never decoded, while
+        images built in memory can be passed as bytes without encoding them first.
 
     text
         Optional plain text version of the email.
@@ -71,71 +108,107 @@ class Email:
     # is a list of files in path from current directory
     external_attachments: list[str] = field(default_factory=list)
 
-    # has structure {filename: base64_string}
-    inline_attachments: dict[str, str] = field(default_factory=dict)
+    # has structure {filename: base64_string | raw_bytes}; base64 text is attached
+    # as-is and raw bytes are encoded once, so neither is converted ahead of time
+    inline_attachments: dict[str, str | bytes] = field(default_factory=dict)
 
     text: str | None = None  # sometimes present in quarto
     recipients: list[str] | None = None  # not present in quarto
 
     def _generate_preview_html(self) -> str:
         """
-        Generate preview HTML with inline attachments embedded as base64 data URIs.
+        Generate preview HTML with inline attachments and the subject line embedded.
 
         This internal method converts `cid:` references in the HTML to base64 data URIs,
-        making the HTML self-contained for preview purposes. This is distinct from the
-        HTML used in egress.py where cid references are kept and images are attached
-        as separate MIME parts.
+        making the HTML self-contained for preview purposes, and shows the subject
+        line at the top of the body. This is distinct from the HTML used in egress.py
+        where cid references are kept and images are attached as separate MIME parts.
+
+        The subject is inserted after the first `<body>` tag, whose search stops at the
+        first match. A handful of `cid:` references are then swapped with `str.replace`,
+        which runs in C; many of them are rewritten in a single regex pass instead.
 
         Returns
         -------
         str
-            HTML content with inline attachments embedded as base64 data URIs.
+            HTML content with inline attachments embedded as base64 data URIs
+            and a subject header.
         """
-        html_with_inline = re.sub(
-            r'src="cid:([^"\s]+)"',
-            _add_base_64_to_inline_attachments(self.inline_attachments),
-            self.html,
-        )
-        return html_with_inline
+        return self._inline_images(self._html_with_subject())
 
-    def _add_subject_header(self, html: str) -> str:
+    def _html_with_subject(self) -> str:
         """
-        Add subject line as a header in the HTML.
+        Return the HTML with the subject header inserted after the first `<body>` tag.
+
+        Returns
+        -------
+        str
+            HTML content with a subject header, or the header prepended if there is
+            no `<body>` tag
+        """
+        subject_ln = self._subject_header_html()
+
+        html = self.html
+        body = _BODY_OPEN_RE.search(html)
+        if body is None:
+            # Fallback: prepend if no <body> tag found
+            return subject_ln + html
+        return html[: body.end()] + subject_ln + html[body.end() :]
+
+    def _inline_images(self, html: str) -> str:
+        """
+        Replace `cid:` image references in the HTML with base64 data URIs.
 
         Parameters
         ----------
         html
-            The HTML content to add the subject to
+            HTML content referencing inline attachments by `cid:`
 
         Returns
         -------
         str
-            HTML with subject header added
+            HTML content with inline attachments embedded as base64 data URIs
         """
-        if self.subject:
-            subject_ln = (
-                '<br><br><strong><span style="font-variant: small-caps;">'
-                "email subject: </span></strong>"
-                f"{self.subject}"
-                "<br>"
-            )
+        inline_attachments = self.inline_attachments
+        if not inline_attachments:
+            return html
+
+        if len(inline_attachments) <= _STR_REPLACE_MAX_CIDS:
+            for cid, img_data in inline_attachments.items():
+                if not img_data:
+                    continue
+                ref = f'src="cid:{cid}"'
+                # Skip cids the regex pass would not match (e.g. ones containing
+                # whitespace), so the result does not depend on the image count
+                if ref in html and _CID_SRC_RE.fullmatch(ref):
+                    uri = _inline_attachment_data_uri(img_data)
+                    html = html.replace(ref, f'src="{uri}"')
         else:
-            subject_ln = ""
-
-        if "<body" in html:
-            html = re.sub(
-                r"(<body[^>]*>)",
-                r"\1" + subject_ln,
-                html,
-                count=1,
-                flags=re.IGNORECASE,
+            html = _CID_SRC_RE.sub(
+                _add_base_64_to_inline_attachments(inline_attachments), html
             )
-        else:
-            # Fallback: prepend if no <body> tag found
-            html = subject_ln + html
 
         return html
 
+    def _subject_header_html(self) -> str:
+        """
+        Return the subject line header shown at the top of previews.
+
+        Returns
+        -------
+        str
+            HTML for the subject header, or an empty string if there is no subject
+        """
+        if not self.subject:
+            return ""
+
+        return (
+            '<br><br><strong><span style="font-variant: small-caps;">'
+            "email subject: </span></strong>"
+            f"{self.subject}"
+            "<br>"
+        )
+
     def _repr_html_(self) -> str:
         """
         Return HTML representation with inline attachments for rich display.
@@ -161,8 +234,7 @@ class Email:
         email
         ```
         """
-        html_with_inline = self._generate_preview_html()
-        html_with_subject = self._add_subject_header(html_with_inline)
+        html_with_subject = self._html_with_subject()
 
         # TODO: this is a dirty workaround for some weird quarto behavior. 
         # There is probably a better approach to previewing that doesn't
@@ -171,17 +243,13 @@ class Email:
         # Strip the <body> tag from MJML output to prevent style bleed
         # MJML generates a full HTML document with <body> styles that can
         # interfere with Quarto/Jupyter page rendering
-        html_without_body = re.sub(
-            r"<body[^>]*>(.*?)</body>",
-            r"\1",
-            html_with_subject,
-            flags=re.DOTALL | re.IGNORECASE,
-        )
+        html_without_body = _BODY_CONTENT_RE.sub(r"\1", html_with_subject)
 
         # Also remove any <html> tags
-        html_without_html = re.sub(
-            r"</?html[^>]*>", "", html_without_body, flags=re.IGNORECASE
-        )
+        html_without_html = _HTML_TAG_RE.sub("", html_without_body)
+
+        # Inline the images last so the regexes above don't scan their base64 data
+        html_without_html = self._inline_images(html_without_html)
 
         # Wrap in a container div to isolate the email preview styles
         wrapped_html = f'<div style="background-color: white; padding: 0; margin: 0; overflow: auto;">{html_without_html}</div>'
@@ -210,13 +278,11 @@ class Email:
         ------
         Raises ValueError if external attachments are present, as preview does not support them.
         """
-        # Generate the preview HTML with inline base64 images
-        html_with_inline = self._generate_preview_html()
-        # Add subject header
-        html_with_inline = self._add_subject_header(html_with_inline)
-
-        with open(out_file, "w", encoding="utf-8") as f:
-            f.write(html_with_inline)
+        # Stream the preview out with inline base64 images spliced in as it is written
+        with open(
+            out_file, "w", encoding="utf-8", newline="", buffering=_WRITE_BUFFER_SIZE
+        ) as f:
+            _write_inlined_html(f, self._html_with_subject(), self.inline_attachments)
 
         if self.external_attachments:
             raise ValueError("Preview does not yet support external attachments.")
@@ -237,12 +303,15 @@ class Email:
         raise NotImplementedError
 
     def show_browser(self):
+        # Only needed for browser previews, so not imported with the package
+        import tempfile
+        import webbrowser
+
         with tempfile.TemporaryDirectory() as tmp_dir:
             f_path = Path(tmp_dir) / "index.html"
 
-            # Generate the preview HTML with inline base64 images
+            # Generate the preview HTML with inline base64 images and subject header
             html_with_inline = self._generate_preview_html()
-            html_with_inline = self._add_subject_header(html_with_inline)
             f_path.write_text(html_with_inline, encoding="utf-8")
 
             # create a server that closes after 1 request ----
@@ -305,7 +374,14 @@ class Email:
 
         # Add inline images only if not empty
         if self.inline_attachments:
-            metadata["email_images"] = self.inline_attachments
+            metadata["email_images"] = {
+                name: (
+                    base64.b64encode(data).decode("ascii")
+                    if isinstance(data, bytes)
+                    else data
+                )
+                for name, data in self.inline_attachments.items()
+            }
 
         # Add suppression flags if they are set (not None)
         if self.email_suppress_report_attachment is not None:
@@ -316,6 +392,12 @@ class Email:
         if self.email_suppress_scheduled is not None:
             metadata["email_suppress_scheduled"] = self.email_suppress_scheduled
 
+        # Inline images make these files large; orjson serializes them in C
+        if orjson is not None:
+            with open(out_file, "wb") as f:
+                f.write(orjson.dumps(metadata, option=orjson.OPT_INDENT_2))
+            return
+
         with open(out_file, "w", encoding="utf-8") as f:
             json.dump(metadata, f, indent=2)
 
@@ -324,12 +406,13 @@ class Email:
 
 
 ## To help mimic Great Tables method: GT.show(target="browser")
-class PatchedHTTPRequestHandler(SimpleHTTPRequestHandler):
-    """Patched handler, which does not log requests to stderr"""
-
-
 def _create_temp_file_server(fname: Path) -> HTTPServer:
     """Return a HTTPServer, so we can serve a single request (to show the table)."""
+    # http.server pulls in http.client and ssl; defer it until a preview is served
+    from http.server import HTTPServer, SimpleHTTPRequestHandler
+
+    class PatchedHTTPRequestHandler(SimpleHTTPRequestHandler):
+        """Patched handler, which does not log requests to stderr"""
 
     Handler = partial(PatchedHTTPRequestHandler, directory=str(fname.parent))
     server = HTTPServer(("127.0.0.1", 0), Handler)
@@ -2,9 +2,11 @@ from unittest.mock import patch, MagicMock, mock_open
 
 
 import pytest
+import dataclasses
 import json
 import tempfile
 import os
+import smtplib
 
 from nbmail.egress import (
     send_email_with_redmail,
@@ -13,6 +15,13 @@ from nbmail.egress import (
     send_email_with_smtp,
     send_email_with_gmail,
     send_quarto_email_with_gmail,
+    SMTPMailer,
+    GmailMailer,
+    SMTPPool,
+    _read_file_as_base64,
+    _guess_mime_type,
+    _text_part,
+    _SMTP,
 )
 from nbmail.structs import Email
 from nbmail.ingress import quarto_json_to_email
@@ -37,8 +46,8 @@ def setup_smtp_mocks(monkeypatch):
     context = mock_smtp.return_value.__enter__.return_value
 
     # Patch in the nbmail.egress module where they're used
-    monkeypatch.setattr("nbmail.egress.smtplib.SMTP", mock_smtp)
-    monkeypatch.setattr("nbmail.egress.smtplib.SMTP_SSL", mock_smtp_ssl)
+    monkeypatch.setattr("nbmail.egress._SMTP", mock_smtp)
+    monkeypatch.setattr("nbmail.egress._SMTP_SSL", mock_smtp_ssl)
 
     return mock_smtp, mock_smtp_ssl, context
 
@@ -79,7 +88,24 @@ def test_send_email_with_smtp_tls(monkeypatch):
     mock_smtp.assert_called_once_with("smtp.example.com", 587)
     context.starttls.assert_called_once()
     context.login.assert_called_once_with("user", "pass")
-    context.sendmail.assert_called_once()
+    context.send_message.assert_called_once()
+
+
+def test_send_email_with_smtp_defaults_to_tls(monkeypatch):
+    email = make_basic_email()
+    mock_smtp, mock_smtp_ssl, context = setup_smtp_mocks(monkeypatch)
+
+    send_email_with_smtp(
+        smtp_host="smtp.example.com",
+        smtp_port=587,
+        username="user",
+        password="pass",
+        i_email=email,
+    )
+
+    mock_smtp.assert_called_once_with("smtp.example.com", 587)
+    mock_smtp_ssl.assert_not_called()
+    context.starttls.assert_called_once()
 
 
 def test_send_email_with_smtp_ssl(monkeypatch):
@@ -97,7 +123,7 @@ def test_send_email_with_smtp_ssl(monkeypatch):
 
     mock_smtp_ssl.assert_called_once_with("smtp.example.com", 465)
     context.login.assert_called_once_with("user", "pass")
-    context.sendmail.assert_called_once()
+    context.send_message.assert_called_once()
 
 
 def test_send_email_with_smtp_with_attachment(monkeypatch):
@@ -116,9 +142,9 @@ def test_send_email_with_smtp_with_attachment(monkeypatch):
             security="tls"
         )
 
-    context.sendmail.assert_called_once()
-    args, kwargs = context.sendmail.call_args
-    email_message = args[2]
+    context.send_message.assert_called_once()
+    args, kwargs = context.send_message.call_args
+    email_message = args[0].as_string()
     assert 'Content-Disposition: attachment; filename="file.txt"' in email_message
 
 
@@ -138,9 +164,9 @@ def test_send_email_with_smtp_unknown_mime_type(monkeypatch):
             security="tls",
         )
 
-    context.sendmail.assert_called_once()
-    args, kwargs = context.sendmail.call_args
-    email_message = args[2]
+    context.send_message.assert_called_once()
+    args, kwargs = context.send_message.call_args
+    email_message = args[0].as_string()
 
     assert "Content-Type: application/octet-stream" in email_message
     assert (
@@ -149,7 +175,7 @@ def test_send_email_with_smtp_unknown_mime_type(monkeypatch):
     )
 
 
-def test_send_email_with_smtp_sendmail_args(monkeypatch):
+def test_send_email_with_smtp_send_message_args(monkeypatch):
     email = make_basic_email()
     mock_smtp, mock_smtp_ssl, context = setup_smtp_mocks(monkeypatch)
 
@@ -162,13 +188,13 @@ def test_send_email_with_smtp_sendmail_args(monkeypatch):
         security="ssl",  # Port 465 uses SSL
     )
 
-    context.sendmail.assert_called_once()
+    context.send_message.assert_called_once()
 
-    # Extract sendmail arguments
-    args, kwargs = context.sendmail.call_args
-    sender = args[0]
-    recipients = args[1]
-    raw_message = args[2]
+    # Extract send_message arguments
+    args, kwargs = context.send_message.call_args
+    sender = kwargs["from_addr"]
+    recipients = kwargs["to_addrs"]
+    raw_message = args[0].as_string()
 
     assert sender == "user@gmail.com"
     assert recipients == ["a@example.com"]
@@ -177,6 +203,369 @@ def test_send_email_with_smtp_sendmail_args(monkeypatch):
     assert "text/html" in raw_message or "<p>Hi</p>" in raw_message
 
 
+def test_smtp_mailer_reuses_connection(monkeypatch):
+    mock_smtp, mock_smtp_ssl, context = setup_smtp_mocks(monkeypatch)
+
+    with SMTPMailer("smtp.example.com", 587, "user", "pass", security="tls") as mailer:
+        mailer.send(make_basic_email())
+        mailer.send(make_basic_email())
+
+    mock_smtp.assert_called_once_with("smtp.example.com", 587)
+    context.starttls.assert_called_once()
+    context.login.assert_called_once_with("user", "pass")
+    assert context.send_message.call_count == 2
+
+
+def test_smtp_mailer_does_not_resend_after_disconnect(monkeypatch):
+    mock_smtp, mock_smtp_ssl, context = setup_smtp_mocks(monkeypatch)
+    # The connection drops after the data phase, when the server may have
+    # already accepted the message
+    context.send_message.side_effect = [smtplib.SMTPServerDisconnected(), None]
+
+    with SMTPMailer("smtp.example.com", 465, "user", "pass", security="ssl") as mailer:
+        with pytest.raises(smtplib.SMTPServerDisconnected):
+            mailer.send(make_basic_email())
+
+        assert context.send_message.call_count == 1
+        assert mailer._server is None
+
+        # The next send opens a fresh connection
+        mailer.send(make_basic_email())
+
+    assert mock_smtp_ssl.call_count == 2
+    assert context.send_message.call_count == 2
+
+
+def test_smtp_mailer_checks_idle_connection(monkeypatch):
+    mock_smtp, mock_smtp_ssl, context = setup_smtp_mocks(monkeypatch)
+    monkeypatch.setattr("nbmail.egress._IDLE_CHECK_SECONDS", 0)
+    context.noop.return_value = (250, b"OK")
+
+    with SMTPMailer("smtp.example.com", 587, "user", "pass") as mailer:
+        mailer.send(make_basic_email())
+
+    context.noop.assert_called_once()
+    mock_smtp.assert_called_once()
+
+
+def test_smtp_mailer_reconnects_when_idle_check_fails(monkeypatch):
+    mock_smtp, mock_smtp_ssl, context = setup_smtp_mocks(monkeypatch)
+    monkeypatch.setattr("nbmail.egress._IDLE_CHECK_SECONDS", 0)
+    context.noop.side_effect = smtplib.SMTPServerDisconnected()
+
+    with SMTPMailer("smtp.example.com", 587, "user", "pass") as mailer:
+        mailer.send(make_basic_email())
+
+    assert mock_smtp.call_count == 2
+    assert context.send_message.call_count == 1
+
+
+def test_smtp_mailer_skips_idle_check_for_recent_connection(monkeypatch):
+    mock_smtp, mock_smtp_ssl, context = setup_smtp_mocks(monkeypatch)
+
+    with SMTPMailer("smtp.example.com", 587, "user", "pass") as mailer:
+        mailer.send(make_basic_email())
+        mailer.send(make_basic_email())
+
+    context.noop.assert_not_called()
+
+
+def test_smtp_mailer_invalid_security():
+    with pytest.raises(ValueError, match="security must be"):
+        SMTPMailer("smtp.example.com", 587, "user", "pass", security="starttls")
+
+
+def test_gmail_mailer_uses_gmail_settings(monkeypatch):
+    mock_smtp, mock_smtp_ssl, context = setup_smtp_mocks(monkeypatch)
+
+    with GmailMailer("user@gmail.com", "pass") as mailer:
+        mailer.send(make_basic_email())
+
+    mock_smtp.assert_called_once_with("smtp.gmail.com", 587)
+    context.starttls.assert_called_once()
+    context.login.assert_called_once_with("user@gmail.com", "pass")
+
+
+def test_smtp_pool_reuses_idle_connection(monkeypatch):
+    mock_smtp, mock_smtp_ssl, context = setup_smtp_mocks(monkeypatch)
+
+    with SMTPPool("smtp.example.com", 587, "user", "pass") as pool:
+        pool.send(make_basic_email())
+        pool.send(make_basic_email())
+
+    mock_smtp.assert_called_once_with("smtp.example.com", 587)
+    assert context.send_message.call_count == 2
+
+
+def test_smtp_pool_recycles_after_message_cap(monkeypatch):
+    mock_smtp, mock_smtp_ssl, context = setup_smtp_mocks(monkeypatch)
+
+    with SMTPPool(
+        "smtp.example.com", 587, "user", "pass", max_messages_per_conn=2
+    ) as pool:
+        for _ in range(3):
+            pool.send(make_basic_email())
+
+    assert mock_smtp.call_count == 2
+    assert context.send_message.call_count == 3
+
+
+def test_smtp_pool_send_many(monkeypatch):
+    mock_smtp, mock_smtp_ssl, context = setup_smtp_mocks(monkeypatch)
+
+    with SMTPPool("smtp.example.com", 587, "user", "pass", max_connections=2) as pool:
+        pool.send_many([make_basic_email() for _ in range(5)])
+
+    assert 1 <= mock_smtp.call_count <= 2
+    assert context.send_message.call_count == 5
+
+
+def test_send_email_with_gmail_uses_pool(monkeypatch):
+    mock_smtp, mock_smtp_ssl, context = setup_smtp_mocks(monkeypatch)
+
+    with SMTPPool("smtp.example.com", 587, "user", "pass") as pool:
+        send_email_with_gmail("ignored@gmail.com", "ignored", make_basic_email(), pool=pool)
+        send_email_with_smtp(
+            "ignored", 0, "ignored", "ignored", make_basic_email(), pool=pool
+        )
+
+    mock_smtp.assert_called_once_with("smtp.example.com", 587)
+    context.login.assert_called_once_with("user", "pass")
+    assert context.send_message.call_count == 2
+
+
+def test_smtp_pool_invalid_limits():
+    with pytest.raises(ValueError, match="max_connections"):
+        SMTPPool("smtp.example.com", 587, "user", "pass", max_connections=0)
+
+    with pytest.raises(ValueError, match="max_messages_per_conn"):
+        SMTPPool("smtp.example.com", 587, "user", "pass", max_messages_per_conn=0)
+
+
+@pytest.mark.parametrize(
+    "msg, chunk",
+    [
+        (b"Subject: x\r\n\r\n.leading\r\n", b"Subject: x\r\n\r\n.leading\r\n"),
+        (b"Subject: x\r\n\r\nno newline", b"Subject: x\r\n\r\nno newline\r\n"),
+    ],
+)
+def test_smtp_data_uses_bdat_when_chunking(msg, chunk):
+    server = _SMTP()
+    server.esmtp_features = {"chunking": ""}
+    server.send = MagicMock()
+    server.getreply = MagicMock(return_value=(250, b"OK"))
+
+    assert server.data(msg) == (250, b"OK")
+
+    sent = [call.args[0] for call in server.send.call_args_list]
+    assert sent == [f"BDAT {len(chunk)} LAST\r\n".encode(), chunk]
+    server.getreply.assert_called_once()
+
+
+def test_read_file_as_base64_matches_email_encoder(tmp_path):
+    from email.mime.base import MIMEBase
+    from email import encoders
+
+    data = os.urandom(2 * 1024 * 1024 + 7)  # spans several read chunks
+    path = tmp_path / "report.bin"
+    path.write_bytes(data)
+
+    part = MIMEBase("application", "octet-stream")
+    part.set_payload(data)
+    encoders.encode_base64(part)
+
+    assert _read_file_as_base64(str(path)) == part.get_payload()
+
+
+@pytest.mark.parametrize("as_bytes", [False, True])
+def test_send_email_with_smtp_inline_image_round_trips(monkeypatch, as_bytes):
+    import base64
+    from email import message_from_string
+
+    img_bytes = os.urandom(500)
+    email = make_basic_email()
+    email.inline_attachments = {
+        "img.png": img_bytes if as_bytes else base64.b64encode(img_bytes).decode("ascii")
+    }
+
+    mock_smtp, mock_smtp_ssl, context = setup_smtp_mocks(monkeypatch)
+    send_email_with_smtp("smtp.example.com", 587, "user", "pass", email, security="tls")
+
+    args, _ = context.send_message.call_args
+    msg = message_from_string(args[0].as_string())
+    (img,) = [part for part in msg.walk() if part.get("Content-ID") == "<img.png>"]
+
+    assert img.get_content_type() == "image/png"
+    assert img["Content-Transfer-Encoding"] == "base64"
+    assert img.get_payload(decode=True) == img_bytes
+    assert all(len(line) <= 76 for line in img.get_payload().splitlines())
+
+
+@pytest.mark.parametrize(
+    "text, inline_attachments, expected_types",
+    [
+        (None, {}, ["text/html"]),
+        ("Plain", {}, ["multipart/alternative", "text/html", "text/plain"]),
+        (None, {"img.png": "QUFB"}, ["multipart/related", "text/html", "image/png"]),
+        (
+            "Plain",
+            {"img.png": "QUFB"},
+            [
+                "multipart/related",
+                "multipart/alternative",
+                "text/html",
+                "text/plain",
+                "image/png",
+            ],
+        ),
+    ],
+)
+def test_send_email_with_smtp_message_structure(
+    monkeypatch, text, inline_attachments, expected_types
+):
+    mock_smtp, mock_smtp_ssl, context = setup_smtp_mocks(monkeypatch)
+    email = Email(
+        html="<p>Hi</p>",
+        subject="Structure",
+        recipients=["a@example.com"],
+        text=text,
+        inline_attachments=inline_attachments,
+    )
+
+    send_email_with_smtp("smtp.example.com", 587, "user", "pass", email, security="tls")
+
+    args, _ = context.send_message.call_args
+    msg = args[0]
+    assert [part.get_content_type() for part in msg.walk()] == expected_types
+    assert msg["Subject"] == "Structure"
+    assert msg["To"] == "a@example.com"
+
+
+def test_inline_image_parts_reused_across_sends(monkeypatch):
+    mock_smtp, mock_smtp_ssl, context = setup_smtp_mocks(monkeypatch)
+    email = make_basic_email()
+
+    def sent_image():
+        args, _ = context.send_message.call_args
+        (img,) = [p for p in args[0].walk() if p.get("Content-ID") == "<img.png>"]
+        return img
+
+    with SMTPMailer("smtp.example.com", 587, "user", "pass") as mailer:
+        mailer.send(email)
+        first = sent_image()
+        mailer.send(email)
+        assert sent_image() is first
+
+        email.inline_attachments["img.png"] = "QUJD"
+        mailer.send(email)
+        assert sent_image() is not first
+        assert sent_image().get_payload(decode=True) == b"ABC"
+
+
+def test_inline_image_parts_cache_not_a_dataclass_field(monkeypatch):
+    mock_smtp, mock_smtp_ssl, context = setup_smtp_mocks(monkeypatch)
+    email = make_basic_email()
+
+    with SMTPMailer("smtp.example.com", 587, "user", "pass") as mailer:
+        mailer.send(email)
+
+    assert email._inline_mime_parts
+    assert "_inline_mime_parts" not in {f.name for f in dataclasses.fields(email)}
+    assert "_inline_mime_parts" not in dataclasses.asdict(email)
+    assert email == make_basic_email()
+
+
+@pytest.mark.parametrize(
+    "head, expected",
+    [
+        (b"\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR", "image/png"),
+        (b"\xff\xd8\xff\xe0\x00\x10JFIF", "image/jpeg"),
+        (b"GIF89a\x01\x00\x01\x00", "image/gif"),
+        (b"RIFF\x24\x00\x00\x00WEBPVP8 ", "image/webp"),
+        (b"RIFF\x24\x00\x00\x00WAVEfmt ", "image/png"),
+        (b"not an image", "image/png"),
+    ],
+)
+@pytest.mark.parametrize("as_bytes", [False, True])
+def test_inline_image_subtype_sniffed(monkeypatch, head, expected, as_bytes):
+    import base64
+
+    mock_smtp, mock_smtp_ssl, context = setup_smtp_mocks(monkeypatch)
+    data = head + b"\x00" * 40
+    email = make_basic_email()
+    email.inline_attachments = {
+        "img": data if as_bytes else base64.b64encode(data).decode("ascii")
+    }
+
+    send_email_with_smtp("smtp.example.com", 587, "user", "pass", email, security="tls")
+
+    args, _ = context.send_message.call_args
+    (img,) = [p for p in args[0].walk() if p.get("Content-ID") == "<img>"]
+    assert img.get_content_type() == expected
+    assert img.get_payload(decode=True) == data
+
+
+@pytest.mark.parametrize(
+    "text, eight_bit, expected_cte",
+    [
+        ("<p>plain ascii</p>", True, "7bit"),
+        ("<p>café</p>", False, "base64"),
+        ("<p>café</p>", True, "8bit"),
+        ("<p>café" + "x" * 1000 + "</p>", True, "base64"),
+    ],
+)
+def test_text_part_transfer_encoding(text, eight_bit, expected_cte):
+    part = _text_part(text, "html", eight_bit)
+
+    assert part["Content-Transfer-Encoding"] == expected_cte
+    assert part.get_payload(decode=True).decode("utf-8") == text
+
+
+@pytest.mark.parametrize(
+    "ext, expected",
+    [
+        (".csv", ("text", "csv")),
+        (".PDF", ("application", "pdf")),
+        ("", ("application", "octet-stream")),
+        (".not-a-real-extension", ("application", "octet-stream")),
+    ],
+)
+def test_guess_mime_type(ext, expected):
+    assert _guess_mime_type(ext) == expected
+
+
+def test_import_does_not_load_email_mime():
+    import subprocess
+    import sys
+
+    code = (
+        "import sys, nbmail.egress; "
+        "print(sorted(m for m in sys.modules if m.startswith('email.mime')))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+
+    assert result.stdout.strip() == "[]"
+
+
+def test_attachment_mime_type_cached_per_lowercase_extension(monkeypatch, tmp_path):
+    _guess_mime_type.cache_clear()
+    mock_smtp, mock_smtp_ssl, context = setup_smtp_mocks(monkeypatch)
+
+    email = make_basic_email()
+    email.external_attachments = []
+    for name in ("a.PDF", "b.pdf", "c.Pdf"):
+        path = tmp_path / name
+        path.write_bytes(b"%PDF")
+        email.external_attachments.append(str(path))
+
+    send_email_with_smtp("smtp.example.com", 587, "user", "pass", email, security="tls")
+
+    info = _guess_mime_type.cache_info()
+    assert (info.misses, info.hits) == (1, 2)
+
+
 # this is probably not the best way to test this,
 # for what it's worth I will test each part separately
 def test_send_quarto_email_with_gmail(monkeypatch):
@@ -186,11 +575,7 @@ def test_send_quarto_email_with_gmail(monkeypatch):
         "nbmail.egress.quarto_json_to_email", mock_quarto_to_email
     )
 
-    # Mock the Gmail sending function
-    mock_send_gmail = MagicMock()
-    monkeypatch.setattr(
-        "nbmail.egress.send_email_with_gmail", mock_send_gmail
-    )
+    mock_smtp, mock_smtp_ssl, context = setup_smtp_mocks(monkeypatch)
 
     # Call the function
     send_quarto_email_with_gmail(
@@ -201,11 +586,30 @@ def test_send_quarto_email_with_gmail(monkeypatch):
     )
 
     mock_quarto_to_email.assert_called_once_with("path/to/metadata.json")
-    mock_send_gmail.assert_called_once()
+    mock_smtp.assert_called_once_with("smtp.gmail.com", 587)
+
+    _, kwargs = context.send_message.call_args
+    assert kwargs["to_addrs"] == ["recipient@example.com"]
+
+
+def test_send_quarto_email_with_gmail_many_files_one_connection(monkeypatch):
+    mock_quarto_to_email = MagicMock(side_effect=lambda path: make_basic_email())
+    monkeypatch.setattr(
+        "nbmail.egress.quarto_json_to_email", mock_quarto_to_email
+    )
+    mock_smtp, mock_smtp_ssl, context = setup_smtp_mocks(monkeypatch)
 
-    _, kwargs = mock_send_gmail.call_args
-    i_email = kwargs.get("i_email")
-    assert i_email.recipients == ["recipient@example.com"]
+    send_quarto_email_with_gmail(
+        username="user@gmail.com",
+        password="pass",
+        json_path=["a.json", "b.json", "c.json"],
+        recipients=["recipient@example.com"],
+    )
+
+    assert mock_quarto_to_email.call_count == 3
+    mock_smtp.assert_called_once()
+    context.login.assert_called_once()
+    assert context.send_message.call_count == 3
 
 
 def test_send_email_with_mailgun(monkeypatch):
@@ -264,6 +668,63 @@ def test_send_email_with_mailgun(monkeypatch):
     }
 
 
+def test_send_email_with_mailgun_streams_attachments(tmp_path):
+    attachment = tmp_path / "report.csv"
+    attachment.write_bytes(b"a,b\n1,2\n")
+
+    email = make_basic_email()
+    email.external_attachments = [str(attachment)]
+
+    sent = {}
+
+    def create(data, files, domain):
+        # The handle is still open while the request is being made
+        (name, handle, content_type) = files[-1][1]
+        sent["name"] = name
+        sent["content_type"] = content_type
+        sent["content"] = handle.read()
+        sent["handle"] = handle
+        return MagicMock()
+
+    mock_client_instance = MagicMock()
+    mock_client_instance.messages.create = create
+
+    with patch("mailgun.client.Client", MagicMock(return_value=mock_client_instance)):
+        send_email_with_mailgun(
+            api_key="test-api-key",
+            domain="mg.example.com",
+            sender="sender@example.com",
+            i_email=email,
+        )
+
+    assert sent["name"] == "report.csv"
+    assert sent["content_type"] == "text/csv"
+    assert sent["content"] == b"a,b\n1,2\n"
+    assert sent["handle"].closed
+
+
+def test_send_email_with_mailgun_without_attachment_containers():
+    email = Email(
+        html="<p>Hi</p>",
+        subject="Test",
+        recipients=["a@example.com"],
+        inline_attachments=None,
+        external_attachments=None,
+    )
+
+    mock_client_instance = MagicMock()
+    with patch("mailgun.client.Client", MagicMock(return_value=mock_client_instance)):
+        send_email_with_mailgun(
+            api_key="test-api-key",
+            domain="mg.example.com",
+            sender="sender@example.com",
+            i_email=email,
+        )
+
+    call_args = mock_client_instance.messages.create.call_args
+    assert call_args.kwargs["files"] is None
+
+
 def test_send_email_with_mailgun_no_recipients():
     email = Email(
         html="<p>Hi</p>",
@@ -377,6 +838,31 @@ def test_email_write_quarto_json_round_trip():
         assert read_email.email_suppress_scheduled == original_email.email_suppress_scheduled
 
 
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_email_write_quarto_json_with_and_without_orjson(tmp_path, monkeypatch, use_orjson):
+    if use_orjson:
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr("nbmail.structs.orjson", None)
+
+    email = Email(
+        html="<html><body><p>Café ✓</p></body></html>",
+        subject="Résumé",
+        inline_attachments={"img1": "aGVsbG8="},
+        email_suppress_scheduled=True,
+    )
+    json_path = tmp_path / "metadata.json"
+    email.write_quarto_json(str(json_path))
+
+    assert json.loads(json_path.read_text(encoding="utf-8")) == {
+        "email_subject": "Résumé",
+        "email_attachments": [],
+        "email_body_html": "<html><body><p>Café ✓</p></body></html>",
+        "email_images": {"img1": "aGVsbG8="},
+        "email_suppress_scheduled": True,
+    }
+
+
 def test_email_write_quarto_json_no_attachments():
     """Test writing an email without attachments or images."""
     email = Email(
@@ -396,6 +882,27 @@ def test_email_write_quarto_json_no_attachments():
         assert "email_images" not in data
 
 
+def test_email_write_quarto_json_bytes_images():
+    """Test that raw bytes inline images are written as base64."""
+    email = Email(
+        html="<html><body><img src='cid:img1'></body></html>",
+        subject="Bytes Images",
+        inline_attachments={"img1": b"\x89PNG raw bytes", "img2": "aGVsbG8="},
+    )
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        json_path = os.path.join(tmpdir, "bytes_images.json")
+        email.write_quarto_json(json_path)
+
+        with open(json_path, "r") as f:
+            data = json.load(f)
+
+        assert data["email_images"] == {
+            "img1": "iVBORyByYXcgYnl0ZXM=",
+            "img2": "aGVsbG8=",
+        }
+
+
 def test_email_write_quarto_json_no_text():
     """Test writing an email without plain text version."""
     email = Email(
@@ -1,8 +1,20 @@
+import asyncio
+import base64
+import json
+import os
 import pytest
+import smtplib
+import socket
 import time
 from aiosmtpd.controller import Controller
 from email import message_from_bytes
-from nbmail.egress import send_email_with_smtp
+from nbmail.egress import (
+    send_email_with_smtp,
+    send_email_with_smtp_async,
+    send_emails_with_smtp_async,
+    _SMTP,
+)
+from nbmail.ingress import quarto_json_to_email
 from nbmail.structs import Email
 
 
@@ -88,3 +100,241 @@ def test_send_email_integration(smtp_server):
     inline_images = [p for p in msg.walk() if p.get('Content-ID')]
     assert len(inline_images) == 1
     assert '<img.png>' in inline_images[0].get('Content-ID')
+
+
+def test_quarto_images_sent_without_reencoding(smtp_server, tmp_path):
+    controller, handler = smtp_server
+
+    img_b64 = base64.b64encode(bytes(range(256)) * 4).decode("ascii")
+    metadata = {
+        "rsc_email_body_html": '<html><body><img src="cid:plot.png"></body></html>',
+        "rsc_email_subject": "Quarto Images",
+        "rsc_email_images": {"plot.png": img_b64},
+    }
+    json_path = tmp_path / ".output_metadata.json"
+    json_path.write_text(json.dumps(metadata), encoding="utf-8")
+
+    email = quarto_json_to_email(str(json_path))
+    email.recipients = ["test@example.com"]
+
+    send_email_with_smtp(
+        smtp_host="127.0.0.1",
+        smtp_port=8025,
+        username="test@example.com",
+        password="password",
+        i_email=email,
+        security="smtp",
+    )
+
+    time.sleep(0.1)
+
+    msg = message_from_bytes(handler.messages[0]["data"])
+    (img,) = [p for p in msg.walk() if p.get("Content-ID") == "<plot.png>"]
+
+    # The base64 text on the wire is Quarto's, only split into MIME lines
+    assert "".join(img.get_payload().split()) == img_b64
+
+
+class PipeliningHandler(EmailHandler):
+    def __init__(self, rejected=()):
+        super().__init__()
+        self.rejected = set(rejected)
+
+    async def handle_EHLO(self, server, session, envelope, hostname, responses):
+        session.host_name = hostname
+        return responses[:-1] + ['250-PIPELINING', responses[-1]]
+
+    async def handle_RCPT(self, server, session, envelope, address, rcpt_options):
+        if address in self.rejected:
+            return '550 No such user'
+        envelope.rcpt_tos.append(address)
+        return '250 OK'
+
+
+def test_send_email_pipelines_envelope(monkeypatch):
+    handler = PipeliningHandler(rejected={"nobody@example.com"})
+    controller = Controller(handler, hostname='127.0.0.1', port=8025)
+    controller.start()
+
+    events = []
+    original_putcmd = smtplib.SMTP.putcmd
+    original_getreply = smtplib.SMTP.getreply
+
+    def recording_putcmd(self, cmd, args=""):
+        events.append(cmd.lower())
+        return original_putcmd(self, cmd, args)
+
+    def recording_getreply(self):
+        events.append("reply")
+        return original_getreply(self)
+
+    monkeypatch.setattr(smtplib.SMTP, "putcmd", recording_putcmd)
+    monkeypatch.setattr(smtplib.SMTP, "getreply", recording_getreply)
+
+    email = Email(
+        html="<html><body><p>Hello</p></body></html>",
+        subject="Pipelined",
+        recipients=["a@example.com", "nobody@example.com", "b@example.com"],
+    )
+
+    try:
+        send_email_with_smtp(
+            smtp_host="127.0.0.1",
+            smtp_port=8025,
+            username="sender@example.com",
+            password="password",
+            i_email=email,
+            security="smtp",
+        )
+    finally:
+        controller.stop()
+
+    assert len(handler.messages) == 1
+    assert handler.messages[0]['rcpt_tos'] == ["a@example.com", "b@example.com"]
+    # MAIL and every RCPT were written before any reply was read
+    start = events.index("mail")
+    assert events[start:start + 4] == ["mail", "rcpt", "rcpt", "rcpt"]
+
+
+def test_send_email_all_recipients_refused_pipelined():
+    handler = PipeliningHandler(rejected={"nobody@example.com"})
+    controller = Controller(handler, hostname='127.0.0.1', port=8025)
+    controller.start()
+
+    email = Email(
+        html="<html><body><p>Hello</p></body></html>",
+        subject="Pipelined",
+        recipients=["nobody@example.com"],
+    )
+
+    try:
+        with pytest.raises(smtplib.SMTPRecipientsRefused):
+            send_email_with_smtp(
+                smtp_host="127.0.0.1",
+                smtp_port=8025,
+                username="sender@example.com",
+                password="password",
+                i_email=email,
+                security="smtp",
+            )
+    finally:
+        controller.stop()
+
+    assert handler.messages == []
+
+
+def test_send_email_with_attachment_and_leading_periods(smtp_server, tmp_path):
+    controller, handler = smtp_server
+
+    attachment = tmp_path / "data.bin"
+    attachment_bytes = os.urandom(100_000)
+    attachment.write_bytes(attachment_bytes)
+
+    email = Email(
+        html="<html><body><p>Body</p></body></html>",
+        subject="Periods",
+        recipients=["test@example.com"],
+        text="first line\n.hidden line\n..two periods\n.",
+        external_attachments=[str(attachment)],
+    )
+
+    send_email_with_smtp(
+        smtp_host="127.0.0.1",
+        smtp_port=8025,
+        username="test@example.com",
+        password="password",
+        i_email=email,
+        security="smtp",
+    )
+
+    assert len(handler.messages) == 1
+    msg = message_from_bytes(handler.messages[0]['data'])
+
+    (text_part,) = [p for p in msg.walk() if p.get_content_type() == "text/plain"]
+    assert text_part.get_payload(decode=True).decode().replace("\r\n", "\n") == email.text
+
+    (file_part,) = [p for p in msg.walk() if p.get_filename() == str(attachment)]
+    assert file_part.get_payload(decode=True) == attachment_bytes
+
+
+def test_smtp_connection_disables_nagle(smtp_server):
+    with _SMTP("127.0.0.1", 8025) as server:
+        assert server.sock.getsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY)
+
+
+def test_send_non_ascii_email_as_8bit(smtp_server):
+    controller, handler = smtp_server
+
+    email = Email(
+        html="<html><body><p>Résumé — naïve café ✓</p></body></html>",
+        subject="8bit",
+        recipients=["test@example.com"],
+        text="Résumé",
+    )
+
+    send_email_with_smtp(
+        smtp_host="127.0.0.1",
+        smtp_port=8025,
+        username="test@example.com",
+        password="password",
+        i_email=email,
+        security="smtp",
+    )
+
+    msg = message_from_bytes(handler.messages[0]['data'])
+    (html_part,) = [p for p in msg.walk() if p.get_content_type() == "text/html"]
+
+    assert html_part["Content-Transfer-Encoding"] == "8bit"
+    assert html_part.get_payload(decode=True).decode("utf-8") == email.html
+
+
+def test_send_emails_with_smtp_async_to_two_servers(smtp_server):
+    pytest.importorskip("aiosmtplib")
+    controller, handler = smtp_server
+
+    other_handler = EmailHandler()
+    other_controller = Controller(other_handler, hostname='127.0.0.1', port=8026)
+    other_controller.start()
+
+    def make_email(i):
+        return Email(
+            html=f"<html><body><p>Message {i}</p></body></html>",
+            subject=f"Async {i}",
+            recipients=[f"user{i}@example.com"],
+            inline_attachments={"img.png": "iVBORw0KGgoAAAANSUhEUgAAAAUA"},
+        )
+
+    async def main():
+        await asyncio.gather(
+            send_emails_with_smtp_async(
+                "127.0.0.1", 8025, "a@example.com", "pw",
+                [make_email(i) for i in range(5)],
+                security="smtp", max_connections=2,
+            ),
+            send_email_with_smtp_async(
+                "127.0.0.1", 8026, "b@example.com", "pw", make_email(99), security="smtp",
+            ),
+        )
+
+    try:
+        asyncio.run(main())
+    finally:
+        other_controller.stop()
+
+    subjects = sorted(message_from_bytes(m['data'])['Subject'] for m in handler.messages)
+    assert subjects == [f"Async {i}" for i in range(5)]
+    assert {m['mail_from'] for m in handler.messages} == {"a@example.com"}
+
+    assert len(other_handler.messages) == 1
+    assert other_handler.messages[0]['rcpt_tos'] == ["user99@example.com"]
+
+
+def test_send_emails_with_smtp_async_invalid_max_connections():
+    pytest.importorskip("aiosmtplib")
+
+    with pytest.raises(ValueError, match="max_connections"):
+        asyncio.run(
+            send_emails_with_smtp_async(
+                "127.0.0.1", 8025, "a@example.com", "pw", [], max_connections=0
+            )
+        )
@@ -30,6 +30,23 @@ def test_email_message_to_email_simple():
     assert result.external_attachments is None
 
 
+def test_email_message_to_email_without_images_writes_preview(tmp_path):
+    msg = EmailMessage()
+    msg["Subject"] = "No Images"
+    msg.set_content("Plain text")
+    msg.add_alternative("<html><body><p>HTML content</p></body></html>", subtype="html")
+
+    result = _email_message_to_email(msg)
+    assert result.inline_attachments is None
+
+    out_file = tmp_path / "preview.html"
+    result.write_preview_email(str(out_file))
+
+    content = out_file.read_text(encoding="utf-8")
+    assert "<p>HTML content</p>" in content
+    assert "No Images" in content
+
+
 def test_email_message_to_email_multiple_recipients():
     msg = EmailMessage()
     msg["Subject"] = "Multi-recipient"
@@ -47,6 +64,18 @@ def test_email_message_to_email_multiple_recipients():
     assert "bcc@example.com" in result.recipients
 
 
+def test_email_message_to_email_display_names_with_commas():
+    msg = EmailMessage()
+    msg["Subject"] = "Display names"
+    msg["To"] = '"Doe, Jane" <jane@example.com>, bob@example.com'
+    msg["Cc"] = "Ann Lee <ann@example.com>"
+    msg.add_alternative("<html><body>Test</body></html>", subtype="html")
+
+    result = _email_message_to_email(msg)
+
+    assert result.recipients == ["jane@example.com", "bob@example.com", "ann@example.com"]
+
+
 def test_email_message_to_email_with_inline_image():
     msg = EmailMessage()
     msg["Subject"] = "With Image"
@@ -63,6 +92,29 @@ def test_email_message_to_email_with_inline_image():
     assert result.inline_attachments["img1"] == b64encode(img_data).decode("utf-8")
 
 
+def test_email_message_to_email_large_inline_image_is_unwrapped():
+    msg = EmailMessage()
+    msg.add_alternative("<html><body><img src='cid:img1'></body></html>", subtype="html")
+    img_data = bytes(range(256)) * 8  # several base64 lines on the wire
+    msg.add_attachment(img_data, maintype="image", subtype="png", cid="img1")
+
+    result = _email_message_to_email(msg)
+
+    assert result.inline_attachments["img1"] == b64encode(img_data).decode("ascii")
+
+
+def test_email_message_to_email_inline_image_without_base64_encoding():
+    msg = EmailMessage()
+    msg.add_alternative("<html><body><img src='cid:svg1'></body></html>", subtype="html")
+    svg = "<svg xmlns='http://www.w3.org/2000/svg'></svg>"
+    msg.add_attachment(svg, subtype="svg+xml", cid="svg1", cte="quoted-printable")
+
+    result = _email_message_to_email(msg)
+
+    # set_content terminates text payloads with a newline
+    assert result.inline_attachments["svg1"] == f"{svg}\n".encode()
+
+
 def test_email_message_to_email_with_external_attachment():
     msg = EmailMessage()
     msg["Subject"] = "With Attachment"
@@ -75,6 +127,22 @@ def test_email_message_to_email_with_external_attachment():
     assert "document.pdf" in result.external_attachments
 
 
+def test_email_message_to_email_nested_related_image_and_attachment():
+    msg = EmailMessage()
+    msg["Subject"] = "Nested"
+    msg.set_content("<html><body><img src='cid:plot'></body></html>", subtype="html")
+    img_data = b"\x89PNG\r\n\x1a\n"
+    msg.add_related(img_data, maintype="image", subtype="png", cid="<plot>")
+    msg.add_attachment(b"a,b\n1,2\n", maintype="text", subtype="csv", filename="data.csv")
+
+    result = _email_message_to_email(msg)
+
+    assert "<img src='cid:plot'>" in result.html
+    assert result.inline_attachments == {"plot": b64encode(img_data).decode("utf-8")}
+    assert result.external_attachments == ["data.csv"]
+    assert result.text is None
+
+
 def test_email_message_to_email_plain_text_only():
     msg = EmailMessage()
     msg["Subject"] = "Plain Only"
@@ -183,7 +251,39 @@ def test_mjml_to_email_with_bytesio():
     cid_filename = list(result.inline_attachments.keys())[0]
     assert cid_filename.endswith(".png")
     assert f"cid:{cid_filename}" in result.html
-    assert result.inline_attachments[cid_filename] != ""
+    assert result.inline_attachments[cid_filename] == b'\x89PNG\r\n\x1a\n'
+
+    # The raw bytes are encoded once, when the preview inlines them
+    b64 = b64encode(b'\x89PNG\r\n\x1a\n').decode("ascii")
+    assert f'src="data:image;base64,{b64}"' in result._inline_images(
+        result.html
+    )
+
+
+def test_mjml_to_email_reuses_compiled_html_for_image_tree():
+    from io import BytesIO
+    from nbmail.mjml import mjml, body, section, column, image
+    from nbmail.mjml._core import _mjml_to_html
+
+    mjml_tag = mjml(
+        body(
+            section(
+                column(
+                    image(attributes={"src": BytesIO(b"\x89PNG\r\n\x1a\n")}),
+                    image(attributes={"src": b"GIF89a"}),
+                )
+            )
+        )
+    )
+    _mjml_to_html.cache_clear()
+
+    first = mjml_to_email(mjml_tag)
+    second = mjml_to_email(mjml_tag)
+
+    assert first.html == second.html
+    assert first.inline_attachments == second.inline_attachments
+    info = _mjml_to_html.cache_info()
+    assert (info.hits, info.misses) == (1, 1)
 
 
 def test_mjml_to_mjml_with_bytesio_raises_error():
@@ -217,6 +317,21 @@ def test_mjml_to_mjml_with_bytesio_raises_error():
     assert len(result.inline_attachments) == 1
 
 
+def test_mjml_to_email_reuses_compiled_html():
+    from nbmail.mjml._core import _mjml_to_html
+
+    mjml_content = "<mjml><mj-body><mj-text>Cached</mj-text></mj-body></mjml>"
+    _mjml_to_html.cache_clear()
+
+    with pytest.warns(UserWarning):
+        first = mjml_to_email(mjml_content)
+    with pytest.warns(UserWarning):
+        second = mjml_to_email(mjml_content)
+
+    assert first.html == second.html
+    assert _mjml_to_html.cache_info().hits == 1
+
+
 def test_quarto_json_to_email_basic(tmp_path):
     json_data = {
         "rsc_email_body_html": "<html><body><p>Quarto email</p></body></html>",
@@ -283,3 +398,25 @@ def test_quarto_json_to_email_empty_lists(tmp_path):
 
     assert result.external_attachments == []
     assert result.inline_attachments == {}
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_quarto_json_to_email_with_and_without_orjson(tmp_path, monkeypatch, use_orjson):
+    if use_orjson:
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr("nbmail.ingress.orjson", None)
+
+    json_data = {
+        "rsc_email_body_html": "<html><body>Caf\u00e9</body></html>",
+        "rsc_email_subject": "Encoding",
+        "rsc_email_images": {"img1": "base64encodedstring"},
+    }
+
+    json_file = tmp_path / "encoding.json"
+    json_file.write_text(json.dumps(json_data, ensure_ascii=False), encoding="utf-8")
+
+    result = quarto_json_to_email(str(json_file))
+
+    assert result.html == "<html><body>Caf\u00e9</body></html>"
+    assert result.inline_attachments == {"img1": "base64encodedstring"}
@@ -1,7 +1,8 @@
 import re
+import sys
 
 import pytest
-from nbmail.structs import Email
+from nbmail.structs import Email, _STR_REPLACE_MAX_CIDS
 
 
 def test_creation_with_text_and_attachments():
@@ -32,6 +33,15 @@ def test_creation_without_text_and_attachments():
     assert email.subject == "No Text or Attachments"
 
 
+@pytest.mark.skipif(sys.version_info < (3, 10), reason="dataclass slots need Python 3.10+")
+def test_email_uses_slots():
+    email = Email(html="<p>Hi</p>", subject="Slots")
+
+    assert not hasattr(email, "__dict__")
+    with pytest.raises(AttributeError):
+        email.recipent = ["typo@example.com"]
+
+
 def test_subject_inserts_after_body(tmp_path):
     html = "<html><body><p>Hello!</p></body></html>"
     email = Email(
@@ -64,6 +74,85 @@ def test_subject_prepends_if_no_body(tmp_path):
     assert content == '<br><br><strong><span style="font-variant: small-caps;">email subject: </span></strong>NoBody<br><p>Hello!</p>'
 
 
+def test_subject_inserted_once_alongside_inline_images(tmp_path):
+    html = '<html><BODY class="x"><img src="cid:a.png"><body></BODY></html>'
+    email = Email(
+        html=html,
+        subject="Once",
+        inline_attachments={"a.png": "AAAA"},
+    )
+    out_file = tmp_path / "preview4.html"
+    email.write_preview_email(str(out_file))
+    content = out_file.read_text(encoding="utf-8")
+
+    assert content.count("email subject:") == 1
+    assert content.startswith('<html><BODY class="x"><br><br><strong>')
+    assert 'src="data:image;base64,AAAA"' in content
+
+
+def test_subject_inserted_after_late_body_without_inline_images(tmp_path):
+    head = "<head><style>" + "p { color: red; }" * 200 + "</style></head>"
+    html = f'<html>{head}<BODY class="x"><p>Hi</p><body></BODY></html>'
+    email = Email(html=html, subject="Late")
+    out_file = tmp_path / "preview5.html"
+    email.write_preview_email(str(out_file))
+    content = out_file.read_text(encoding="utf-8")
+
+    assert content.count("email subject:") == 1
+    assert f'<html>{head}<BODY class="x"><br><br><strong>' in content
+
+
+@pytest.mark.parametrize("n_images", [3, 40])
+def test_preview_replaces_every_cid_reference(n_images):
+    cids = [f"img{i}.png" for i in range(n_images)]
+    html = "<html><body>" + "".join(f'<img src="cid:{c}">' for c in cids)
+    html += '<img src="cid:img0.png"><img src="cid:unknown.png"></body></html>'
+    email = Email(
+        html=html,
+        subject="Many",
+        inline_attachments={c: f"QUFB{i:04d}" for i, c in enumerate(cids)},
+    )
+
+    content = email._generate_preview_html()
+
+    assert content.count('src="data:image;base64,QUFB0000"') == 2
+    assert f'src="data:image;base64,QUFB{n_images - 1:04d}"' in content
+    assert 'src="cid:unknown.png"' in content
+    assert content.count("src=\"cid:") == 1
+    assert content.count("email subject:") == 1
+
+
+def test_repr_html_strips_document_tags_and_inlines_images():
+    email = Email(
+        html='<html><body class="x"><img src="cid:a.png"></body></html>',
+        subject="Repr",
+        inline_attachments={"a.png": "QUFB"},
+    )
+
+    content = email._repr_html_()
+
+    assert "<body" not in content and "</body>" not in content
+    assert "<html" not in content and "</html>" not in content
+    assert 'src="data:image;base64,QUFB"' in content
+    assert content.count("email subject:") == 1
+
+
+@pytest.mark.parametrize("n_fillers", [0, _STR_REPLACE_MAX_CIDS])
+def test_inline_images_same_result_either_side_of_replace_threshold(n_fillers):
+    attachments = {"ok.png": "QUFB", "my image.png": "QkJC"}
+    attachments.update({f"filler{i}.png": "Q0ND" for i in range(n_fillers)})
+    email = Email(
+        html='<img src="cid:ok.png"><img src="cid:my image.png">',
+        subject="Threshold",
+        inline_attachments=attachments,
+    )
+
+    content = email._inline_images(email.html)
+
+    # A cid containing whitespace is left alone whichever path is taken
+    assert content == '<img src="data:image;base64,QUFB"><img src="cid:my image.png">'
+
+
 def test_raises_on_external_attachments(tmp_path):
     html = "<p>Test</p>"
     email = Email(
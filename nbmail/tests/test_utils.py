@@ -1,10 +1,11 @@
 import base64
 from email.message import EmailMessage
-import re
 
 from nbmail.utils import (
     write_email_message_to_file,
+    _CID_SRC_RE,
     _add_base_64_to_inline_attachments,
+    _write_inlined_html,
 )
 
 
@@ -66,6 +67,22 @@ def test_write_email_message_to_file_multiple_inline_images(tmp_path):
     assert content.count('src="data:image;base64,') == 2
 
 
+def test_write_email_message_to_file_cid_with_whitespace_not_inlined(tmp_path):
+    msg = EmailMessage()
+    msg.add_alternative('<html><body><img src="cid:my image"></body></html>', subtype="html")
+
+    img_data = b"\x89PNG\r\n\x1a\n"
+    msg.add_attachment(img_data, maintype="image", subtype="png", cid="my image")
+
+    out_file = tmp_path / "output_space.html"
+    write_email_message_to_file(msg, str(out_file))
+
+    # Like Email previews, cids containing whitespace are not inlined
+    content = out_file.read_text(encoding="utf-8")
+    assert 'src="cid:my image"' in content
+    assert "data:image" not in content
+
+
 def test_write_email_message_to_file_default_filename(tmp_path, monkeypatch):
     msg = EmailMessage()
     msg.add_alternative("<html><body><p>Default</p></body></html>", subtype="html")
@@ -87,8 +104,7 @@ def test_add_base_64_to_inline_attachments_single_image():
     inline_attachments = {"img1": b"\x89PNG\r\n\x1a\n"}
 
     html = '<html><body><img src="cid:img1"></body></html>'
-    result = re.sub(
-        r'src="cid:([^"\s]+)"',
+    result = _CID_SRC_RE.sub(
         _add_base_64_to_inline_attachments(inline_attachments),
         html,
     )
@@ -108,8 +124,7 @@ def test_add_base_64_to_inline_attachments_multiple_images():
         <img src="cid:img2">
     </body></html>"""
 
-    result = re.sub(
-        r'src="cid:([^"\s]+)"',
+    result = _CID_SRC_RE.sub(
         _add_base_64_to_inline_attachments(inline_attachments),
         html,
     )
@@ -128,8 +143,7 @@ def test_add_base_64_to_inline_attachments_missing_cid():
     inline_attachments = {"img1": b"image1data"}
 
     html = '<html><body><img src="cid:missing"></body></html>'
-    result = re.sub(
-        r'src="cid:([^"\s]+)"',
+    result = _CID_SRC_RE.sub(
         _add_base_64_to_inline_attachments(inline_attachments),
         html,
     )
@@ -142,8 +156,7 @@ def test_add_base_64_to_inline_attachments_empty_dict():
     inline_attachments = {}
 
     html = '<html><body><img src="cid:img1"></body></html>'
-    result = re.sub(
-        r'src="cid:([^"\s]+)"',
+    result = _CID_SRC_RE.sub(
         _add_base_64_to_inline_attachments(inline_attachments),
         html,
     )
@@ -152,12 +165,18 @@ def test_add_base_64_to_inline_attachments_empty_dict():
     assert 'src="cid:img1"' in result
 
 
+def test_add_base_64_to_inline_attachments_none():
+    html = '<html><body><img src="cid:img1"></body></html>'
+    result = _CID_SRC_RE.sub(_add_base_64_to_inline_attachments(None), html)
+
+    assert result == html
+
+
 def test_add_base_64_to_inline_attachments_no_cid_in_html():
     inline_attachments = {"img1": b"image1data"}
 
     html = '<html><body><img src="https://example.com/image.png"></body></html>'
-    result = re.sub(
-        r'src="cid:([^"\s]+)"',
+    result = _CID_SRC_RE.sub(
         _add_base_64_to_inline_attachments(inline_attachments),
         html,
     )
@@ -175,8 +194,7 @@ def test_add_base_64_to_inline_attachments_string_base64():
     }
 
     html = '<html><body><img src="cid:img1"></body></html>'
-    result = re.sub(
-        r'src="cid:([^"\s]+)"',
+    result = _CID_SRC_RE.sub(
         _add_base_64_to_inline_attachments(inline_attachments),
         html,
     )
@@ -194,8 +212,7 @@ def test_add_base_64_to_inline_attachments_string_not_base64():
     }
 
     html = '<html><body><img src="cid:img1"></body></html>'
-    result = re.sub(
-        r'src="cid:([^"\s]+)"',
+    result = _CID_SRC_RE.sub(
         _add_base_64_to_inline_attachments(inline_attachments),
         html,
     )
@@ -208,3 +225,71 @@ def test_add_base_64_to_inline_attachments_string_not_base64():
         "utf-8"
     )
     assert expected_base64 in result
+
+
+def test_add_base_64_to_inline_attachments_short_string_not_base64():
+    # Every character is in the base64 alphabet, but the length is not
+    result = _CID_SRC_RE.sub(
+        _add_base_64_to_inline_attachments({"img1": "hello"}),
+        '<img src="cid:img1">',
+    )
+
+    assert result == '<img src="data:image;base64,aGVsbG8=">'
+
+
+def test_add_base_64_to_inline_attachments_string_base64_spliced_as_is(monkeypatch):
+    base64_string = base64.encodebytes(b"x" * 200).decode("ascii")
+
+    def fail(*args, **kwargs):
+        raise AssertionError("base64 strings should not be re-encoded")
+
+    monkeypatch.setattr("nbmail.utils.base64.b64decode", fail)
+    monkeypatch.setattr("nbmail.utils.base64.b64encode", fail)
+
+    html = '<img src="cid:img1">'
+    result = _CID_SRC_RE.sub(
+        _add_base_64_to_inline_attachments({"img1": base64_string}),
+        html,
+    )
+
+    assert result == f'<img src="data:image;base64,{"".join(base64_string.split())}">'
+
+
+def test_write_inlined_html_matches_substitution():
+    import io
+
+    inline_attachments = {"img1": b"image1data", "img2": "aW1hZ2UyZGF0YQ==", "empty": ""}
+    html = (
+        '<img src="cid:img1"><p>text</p><img src="cid:img2">'
+        '<img src="cid:img1"><img src="cid:missing"><img src="cid:empty">'
+    )
+
+    out = io.StringIO()
+    _write_inlined_html(out, html, inline_attachments)
+
+    expected = _CID_SRC_RE.sub(
+        _add_base_64_to_inline_attachments(inline_attachments),
+        html,
+    )
+    assert out.getvalue() == expected
+
+
+def test_add_base_64_to_inline_attachments_repeated_cid_encoded_once(monkeypatch):
+    calls = []
+    original = base64.b64encode
+
+    def counting_b64encode(data):
+        calls.append(data)
+        return original(data)
+
+    monkeypatch.setattr("nbmail.utils.base64.b64encode", counting_b64encode)
+
+    html = '<img src="cid:logo"><p>body</p><img src="cid:logo">'
+    result = _CID_SRC_RE.sub(
+        _add_base_64_to_inline_attachments({"logo": b"logodata"}),
+        html,
+    )
+
+    expected_src = f'src="data:image;base64,{original(b"logodata").decode()}"'
+    assert result.count(expected_src) == 2
+    assert len(calls) == 1
@@ -1,35 +1,98 @@
 from __future__ import annotations
-import base64
+
+# pybase64 is a drop-in for the base64 functions used here, with SIMD codecs
+try:
+    import pybase64 as base64
+except ImportError:
+    import base64
+
+import binascii
 from email.message import EmailMessage
 import re
 
 __all__ = ["write_email_message_to_file"]
 
+_CID_SRC_RE = re.compile(r'src="cid:([^"\s]+)"')
+_BASE64_PREFIX_RE = re.compile(r"[A-Za-z0-9+/]+={0,2}")
+
 
 # TODO: make sure this is not losing other attributes of the inline attachments
-def _add_base_64_to_inline_attachments(inline_attachments: dict[str, str]):
+def _add_base_64_to_inline_attachments(
+    inline_attachments: dict[str, str | bytes] | None,
+):
+    # Emails parsed without any images carry None rather than an empty dict
+    get_attachment = (inline_attachments or {}).get
+    # An image referenced more than once (e.g. a logo in header and footer) is
+    # only turned into a data URI on its first match
+    cache: dict[str, str] = {}
+
     # Replace all src="cid:..." in the HTML
     def replace_cid(match):
         cid = match.group(1)
-        img_data = inline_attachments.get(cid)
+        src = cache.get(cid)
+        if src is not None:
+            return src
+        img_data = get_attachment(cid)
         if img_data:
-            # TODO: this is kinda hacky
-            # If it's a string, decode from base64 to bytes first
-            if isinstance(img_data, str):
-                try:
-                    img_bytes = base64.b64decode(img_data)
-                except Exception:
-                    # If not base64, treat as raw bytes
-                    img_bytes = img_data.encode("utf-8")
-            else:
-                img_bytes = img_data
-            b64 = base64.b64encode(img_bytes).decode("utf-8")
-            return f'src="data:image;base64,{b64}"'
+            src = cache[cid] = f'src="{_inline_attachment_data_uri(img_data)}"'
+            return src
         return match.group(0)
 
     return replace_cid
 
 
+def _inline_attachment_data_uri(img_data: str | bytes) -> str:
+    # TODO: this is kinda hacky
+    # A base64 string is spliced in as-is rather than being decoded only to be
+    # encoded again; anything else is encoded once
+    b64 = _as_base64(img_data) if isinstance(img_data, str) else None
+    if b64 is None:
+        if isinstance(img_data, str):
+            img_data = img_data.encode("utf-8")
+        b64 = base64.b64encode(img_data).decode("ascii")
+    return f"data:image;base64,{b64}"
+
+
+def _as_base64(text: str) -> str | None:
+    # Return `text` without line breaks if it is base64, or None otherwise. Only the
+    # length and a leading block are checked, so large payloads are not decoded
+    b64 = "".join(text.split()) if "\n" in text else text
+    if not b64 or len(b64) % 4 or not _BASE64_PREFIX_RE.fullmatch(b64[:64]):
+        return None
+    try:
+        binascii.a2b_base64(b64[:64])
+    except binascii.Error:
+        return None
+    return b64
+
+
+def _write_inlined_html(
+    f, html: str, inline_attachments: dict[str, str | bytes] | None
+) -> None:
+    # Stream the HTML to `f` span by span so the document with every image
+    # payload spliced in never exists as one string
+    if not inline_attachments:
+        f.write(html)
+        return
+    get_attachment = inline_attachments.get
+    uris = {}
+    last = 0
+    for match in _CID_SRC_RE.finditer(html):
+        cid = match.group(1)
+        uri = uris.get(cid)
+        if uri is None:
+            img_data = get_attachment(cid)
+            if not img_data:
+                continue
+            uri = uris[cid] = _inline_attachment_data_uri(img_data)
+        f.write(html[last : match.start()])
+        f.write('src="')
+        f.write(uri)
+        f.write('"')
+        last = match.end()
+    f.write(html[last:] if last else html)
+
+
 def write_email_message_to_file(
     msg: EmailMessage, out_file: str = "preview_email.html"
 ):
@@ -61,13 +124,6 @@ def write_email_message_to_file(
 
     html = msg.get_body(preferencelist=("html")).get_content()
 
-    # Replace each cid reference with base64 data
-    html_inline = re.sub(
-        r'src="cid:([^"]+)"',
-        _add_base_64_to_inline_attachments(inline_attachments),
-        html,
-    )
-
-    # Write to file
+    # Replace each cid reference with base64 data as the file is written
     with open(out_file, "w", encoding="utf-8") as f:
-        f.write(html_inline)
+        _write_inlined_html(f, html, inline_attachments)